@@ -0,0 +1,83 @@
+"""Асинхронные обработчики чтения для запуска под ASGI.
+
+Django 3.2 выполняет синхронные представления под ASGI в одном общем
+потоке, поэтому медленные запросы ждут друг друга. Здесь GET-запросы
+к каталогу, отзывам и комментариям уходят в отдельный пул потоков,
+а запись идёт прежним путём. Асинхронного ORM в Django 3.2 нет, так что
+сами запросы к БД выполняются в потоках пула; у каждого потока своё
+соединение, и при CONN_MAX_AGE пул работает как пул соединений.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import URLPattern, URLResolver
+
+from api import metrics
+from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
+                       ReviewViewSet, TitleViewSet)
+
+ASYNC_READ_VIEWSETS = (
+    TitleViewSet, GenreViewSet, CategoryViewSet, ReviewViewSet,
+    CommentViewSet,
+)
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+read_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_READ_WORKERS,
+    thread_name_prefix='api-read')
+
+
+def run_read(view, request, *args, **kwargs):
+    close_old_connections()
+    # Запросы потока пула не видны обёртке, которую RequestMetricsMiddleware
+    # поставила на соединения своего потока: таймер переносится сюда.
+    timer = getattr(request, '_metrics_timer', None)
+    try:
+        with metrics.timed_queries(timer):
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                started = time.perf_counter()
+                response = response.render()
+                if timer is not None:
+                    request._metrics_render += (
+                        time.perf_counter() - started)
+        return response
+    finally:
+        close_old_connections()
+
+
+def make_async_read_view(view):
+    write_view = sync_to_async(view, thread_sensitive=True)
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await write_view(request, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            read_executor,
+            functools.partial(run_read, view, request, *args, **kwargs))
+
+    return async_view
+
+
+def with_async_reads(patterns):
+    """ Копия urlpatterns, где чтение из ASYNC_READ_VIEWSETS асинхронно. """
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            resolver = URLResolver(
+                pattern.pattern, with_async_reads(pattern.url_patterns),
+                pattern.default_kwargs, pattern.app_name, pattern.namespace)
+            result.append(resolver)
+        elif getattr(pattern.callback, 'cls', None) in ASYNC_READ_VIEWSETS:
+            result.append(URLPattern(
+                pattern.pattern, make_async_read_view(pattern.callback),
+                pattern.default_args, pattern.name))
+        else:
+            result.append(pattern)
+    return result
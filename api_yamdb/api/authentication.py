@@ -0,0 +1,84 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+
+
+class RoleAccessToken(AccessToken):
+    """ Access-токен с ролью и флагами пользователя в claims. """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class UserCache:
+    """ Пользователи по id с коротким TTL, общий для потоков процесса. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = OrderedDict()
+
+    def get(self, user_id):
+        with self.lock:
+            cached = self.users.get(user_id)
+            if cached is None:
+                return None
+            user, expires = cached
+            if expires < time.monotonic():
+                del self.users[user_id]
+                return None
+            self.users.move_to_end(user_id)
+        # Представления меняют request.user, поэтому наружу идёт копия.
+        return copy.copy(user)
+
+    def set(self, user):
+        with self.lock:
+            self.users[user.pk] = (
+                copy.copy(user),
+                time.monotonic() + settings.AUTH_USER_CACHE['TIMEOUT'])
+            self.users.move_to_end(user.pk)
+            while len(self.users) > settings.AUTH_USER_CACHE['MAX_SIZE']:
+                self.users.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """ JWT-аутентификация без запроса пользователя в БД на каждый вызов.
+
+    Пользователь берётся из кэша процесса, если роль в нём совпадает
+    с claims токена; иначе, как и раньше, читается из БД.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is not None and all(
+            validated_token.get(claim, getattr(user, claim))
+            == getattr(user, claim)
+            for claim in ROLE_CLAIMS
+        ):
+            return user
+        user = super().get_user(validated_token)
+        user_cache.set(user)
+        return user
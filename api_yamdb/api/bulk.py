@@ -0,0 +1,149 @@
+"""Пакетное создание и изменение произведений.
+
+Все slug'и категорий и жанров пакета ищутся двумя запросами, произведения
+пишутся через bulk_create/bulk_update, а связи с жанрами — одной вставкой
+в промежуточную таблицу. Ошибки возвращаются для каждого элемента
+отдельно, корректные элементы при этом сохраняются.
+"""
+from django.db import connection, transaction
+from django.db.models import Max
+
+from api.cache import invalidate_model
+from api.serializers import TitleBulkSerializer
+from reviews.models import Category, Genre, Title
+
+TITLE_FIELDS = ('name', 'description', 'year', 'category')
+BATCH_SIZE = 500
+
+
+def validate_items(items):
+    """ Проверенные данные по индексам элементов и ошибки остальных. """
+    valid, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = TitleBulkSerializer(
+            data=item, partial=isinstance(item, dict) and 'id' in item)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+    return valid, errors
+
+
+def resolve_references(valid, errors):
+    """ Меняет slug'и на id; элементы с неизвестными slug'ами — в ошибки. """
+    category_slugs = {data['category'] for data in valid.values()
+                      if 'category' in data}
+    genre_slugs = {slug for data in valid.values()
+                   for slug in data.get('genre', ())}
+    categories = dict(Category.objects.filter(
+        slug__in=category_slugs).values_list('slug', 'pk'))
+    genres = dict(Genre.objects.filter(
+        slug__in=genre_slugs).values_list('slug', 'pk'))
+    for index, data in list(valid.items()):
+        item_errors = {}
+        if 'category' in data:
+            if data['category'] in categories:
+                data['category'] = categories[data['category']]
+            else:
+                item_errors['category'] = [
+                    f'Категория {data["category"]} не найдена.']
+        if 'genre' in data:
+            missing = [slug for slug in data['genre'] if slug not in genres]
+            if missing:
+                item_errors['genre'] = [
+                    f'Жанр {slug} не найден.' for slug in missing]
+            data['genre'] = list(dict.fromkeys(
+                genres[slug] for slug in data['genre'] if slug in genres))
+        if item_errors:
+            errors[index] = item_errors
+            del valid[index]
+
+
+def resolve_titles(valid, errors):
+    """ Произведения для изменения; несуществующие id и повторы — в ошибки. """
+    ids = [data['id'] for data in valid.values() if 'id' in data]
+    titles = Title.objects.in_bulk(ids) if ids else {}
+    seen = set()
+    for index, data in list(valid.items()):
+        title_id = data.get('id')
+        if title_id is None:
+            continue
+        if title_id not in titles:
+            errors[index] = {'id': [f'Произведение {title_id} не найдено.']}
+        elif title_id in seen:
+            errors[index] = {'id': [f'Произведение {title_id} уже есть '
+                                    f'в пакете.']}
+        seen.add(title_id)
+        if index in errors:
+            del valid[index]
+    return titles
+
+
+def set_created_ids(titles):
+    """ Django 3.2 не получает id из bulk_create на SQLite.
+
+    В транзакции после первой вставки SQLite никого больше не пускает
+    писать, поэтому новые строки — последние подряд идущие id таблицы.
+    """
+    if not titles:
+        return
+    last_id = Title.objects.aggregate(last_id=Max('pk'))['last_id']
+    for title_id, title in enumerate(titles, last_id - len(titles) + 1):
+        title.pk = title_id
+
+
+def build_titles(valid, existing):
+    """ Новые и изменённые объекты Title и жанры по индексам элементов. """
+    created, updated, genre_links = {}, {}, {}
+    for index, data in valid.items():
+        if 'id' in data:
+            title = updated[index] = existing[data['id']]
+        else:
+            title = created[index] = Title(description='')
+        for field in TITLE_FIELDS:
+            if field in data:
+                setattr(title, f'{field}_id' if field == 'category'
+                        else field, data[field])
+        if 'genre' in data:
+            genre_links[index] = data['genre']
+    return created, updated, genre_links
+
+
+def write_titles(created, updated, genre_links):
+    with transaction.atomic():
+        Title.objects.bulk_create(created.values(), batch_size=BATCH_SIZE)
+        if connection.vendor == 'sqlite':
+            set_created_ids(list(created.values()))
+        Title.objects.bulk_update(
+            updated.values(), TITLE_FIELDS, batch_size=BATCH_SIZE)
+        through = Title.genre.through
+        relinked = [updated[index].pk for index in genre_links
+                    if index in updated]
+        if relinked:
+            through.objects.filter(title__in=relinked).delete()
+        through.objects.bulk_create([
+            through(title_id=(created.get(index) or updated[index]).pk,
+                    genre_id=genre_id)
+            for index, genre_ids in genre_links.items()
+            for genre_id in genre_ids
+        ], batch_size=BATCH_SIZE)
+        if created or updated:
+            invalidate_model(Title)
+
+
+def save_titles(items):
+    """ Сохраняет пакет; результат по каждому элементу в порядке запроса. """
+    valid, errors = validate_items(items)
+    resolve_references(valid, errors)
+    existing = resolve_titles(valid, errors)
+    created, updated, genre_links = build_titles(valid, existing)
+    write_titles(created, updated, genre_links)
+    results = []
+    for index in range(len(items)):
+        if index in errors:
+            results.append({'errors': errors[index]})
+        else:
+            title = created.get(index) or updated[index]
+            results.append({'id': title.pk, 'created': index in created})
+    return {'created': len(created), 'updated': len(updated),
+            'results': results}
@@ -0,0 +1,183 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb import db_routers
+
+STATS_KEYS = ('hits', 'misses', 'not_modified')
+
+
+def get_cache():
+    return caches[settings.API_CACHE['ALIAS']]
+
+
+def get_state_cache():
+    return caches[settings.API_CACHE['STATE_ALIAS']]
+
+
+def make_key(*parts):
+    return ':'.join((settings.API_CACHE['KEY_PREFIX'],) + parts)
+
+
+def is_primary_read():
+    """ Данные читаются из основной базы и соответствуют версиям моделей.
+
+    Реплика может отставать от версий, которые запись в основную базу уже
+    увеличила: прочитанное с неё не кэшируется и не получает ETag, иначе
+    старые данные остались бы в кэше и у клиентов под новой версией.
+    """
+    return not db_routers.replicas_in_use()
+
+
+def get_model_state(models):
+    """ Версии данных моделей и время последней записи в их таблицы.
+
+    Версия меняется при каждой записи в таблицу модели.
+    """
+    cache = get_state_cache()
+    labels = [model._meta.label_lower for model in models]
+    keys = [make_key(kind, label)
+            for label in labels for kind in ('version', 'modified')]
+    state = cache.get_many(keys)
+    missing = [label for label in labels
+               if make_key('version', label) not in state
+               or make_key('modified', label) not in state]
+    for label in missing:
+        # Версия могла быть вытеснена из кэша: берём заведомо новую,
+        # чтобы не вернуть ответы, закэшированные до вытеснения.
+        cache.add(make_key('version', label), time.time_ns(), None)
+        cache.add(make_key('modified', label), int(time.time()), None)
+    if missing:
+        state = cache.get_many(keys)
+    versions = tuple(state[make_key('version', label)] for label in labels)
+    modified = max(
+        (state[make_key('modified', label)] for label in labels), default=0)
+    return versions, modified
+
+
+def bump_model_version(model):
+    cache = get_state_cache()
+    label = model._meta.label_lower
+    try:
+        cache.incr(make_key('version', label))
+    except ValueError:
+        cache.set(make_key('version', label), time.time_ns(), None)
+    cache.set(make_key('modified', label), int(time.time()), None)
+
+
+def invalidate_model(model):
+    """ Сбрасывает ответы, зависящие от модели, после фиксации транзакции. """
+    transaction.on_commit(lambda: bump_model_version(model))
+
+
+def count(event):
+    cache = get_cache()
+    key = make_key('stats', event)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_stats():
+    cache = get_cache()
+    stats = {event: cache.get(make_key('stats', event), 0)
+             for event in STATS_KEYS}
+    requests = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / requests if requests else None
+    return stats
+
+
+class CachedResponseMixin:
+    """ Кэш и условные GET-запросы для ответов на чтение.
+
+    ETag и Last-Modified считаются по версиям `cache_models`, без запросов
+    к БД; при совпадении с If-None-Match/If-Modified-Since отдаётся 304,
+    если запрошенный объект существует.
+    """
+    cache_models = ()
+
+    def get_etag(self, request, versions):
+        digest = hashlib.sha1('|'.join((
+            self.basename, self.action, request.accepted_renderer.format,
+            request.build_absolute_uri(),
+            '.'.join(str(version) for version in versions),
+        )).encode('utf-8')).hexdigest()
+        return f'"{digest}"'
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = {tag.strip() for tag in if_none_match.split(',')}
+            return bool(tags & {'*', etag, f'W/{etag}'})
+        if_modified_since = parse_http_date_safe(
+            request.headers.get('If-Modified-Since'))
+        return (if_modified_since is not None
+                and last_modified <= if_modified_since)
+
+    def check_exists(self):
+        # Вложенные списки ищут родительский объект в get_queryset().
+        self.get_queryset()
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        versions, last_modified = get_model_state(self.cache_models)
+        etag = self.get_etag(request, versions)
+        headers = {'ETag': etag, 'Last-Modified': http_date(last_modified)}
+        if self.is_not_modified(request, etag, last_modified):
+            # Версии не знают об отдельных объектах: 304 отдаётся только
+            # для существующего ресурса, иначе обработчик вернёт 404.
+            self.check_exists()
+            count('not_modified')
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        if not settings.API_CACHE['ENABLED']:
+            response = handler(request, *args, **kwargs)
+            current = is_primary_read()
+        else:
+            response, current = self.get_response_from_cache(
+                handler, make_key('response', etag.strip('"')),
+                request, *args, **kwargs)
+        if current and response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def get_response_from_cache(self, handler, key, request, *args,
+                                **kwargs):
+        """ Ответ и признак того, что он соответствует текущим версиям. """
+        cache = get_cache()
+        data = cache.get(key)
+        if data is not None:
+            count('hits')
+            return Response(data), True
+        count('misses')
+        response = handler(request, *args, **kwargs)
+        current = is_primary_read()
+        if current and response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE['TIMEOUT'])
+        return response, current
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def check_exists(self):
+        if self.action == 'retrieve':
+            self.get_object()
+        else:
+            super().check_exists()
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
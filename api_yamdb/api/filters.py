@@ -1,12 +1,30 @@
-from django_filters.rest_framework import FilterSet, CharFilter
+from django.conf import settings
+from django.db.models import Case, When
+from django_filters.rest_framework import (BaseInFilter, CharFilter,
+                                           FilterSet, NumberFilter)
+from rest_framework.exceptions import ValidationError
 
 from reviews.models import Title
 
 
+class NumberInFilter(BaseInFilter, NumberFilter):
+    pass
+
+
 class TitleFilter(FilterSet):
     category = CharFilter(field_name='category__slug')
     genre = CharFilter(field_name='genre__slug')
+    ids = NumberInFilter(method='filter_ids')
 
     class Meta:
         model = Title
-        fields = ['name', 'year', 'category', 'genre']
+        fields = ['name', 'year', 'category', 'genre', 'ids']
+
+    def filter_ids(self, queryset, name, value):
+        """ Произведения из списка id в том порядке, в котором их просили. """
+        if len(value) > settings.LIMIT_BATCH_IDS:
+            raise ValidationError({
+                'ids': f'Не больше {settings.LIMIT_BATCH_IDS} id за запрос.'})
+        return queryset.filter(pk__in=value).order_by(Case(
+            *(When(pk=pk, then=position)
+              for position, pk in enumerate(value))))
@@ -0,0 +1,142 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_lock = threading.Lock()
+_routes = {}
+
+
+class QueryTimer:
+    """ Обёртка над курсором: считает запросы и время в БД. """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+@contextmanager
+def timed_queries(timer):
+    """ Запросы всех соединений текущего потока идут через timer.
+
+    Соединения у каждого потока свои, поэтому обработчик, выполняющий
+    запрос в другом потоке, оборачивает свои соединения сам.
+    """
+    with ExitStack() as stack:
+        if timer is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+        yield
+
+
+@contextmanager
+def timed_serialization(request):
+    """ Время внутри блока идёт в метрику serialize запроса. """
+    request = getattr(request, '_request', request)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if hasattr(request, '_metrics_serialize'):
+            request._metrics_serialize += time.perf_counter() - started
+
+
+def observe(route, total, db, queries, render, serialize):
+    with _lock:
+        stats = _routes.setdefault(route, {
+            'count': 0,
+            'total_ms': 0.0,
+            'db_ms': 0.0,
+            'render_ms': 0.0,
+            'serialize_ms': 0.0,
+            'queries': 0,
+            'buckets': [0] * (len(BUCKETS_MS) + 1),
+        })
+        stats['count'] += 1
+        stats['total_ms'] += total
+        stats['db_ms'] += db
+        stats['render_ms'] += render
+        stats['serialize_ms'] += serialize
+        stats['queries'] += queries
+        stats['buckets'][bisect_left(BUCKETS_MS, total)] += 1
+
+
+def get_metrics():
+    """ Гистограммы времени ответа и средние значения по маршрутам. """
+    bounds = [str(bound) for bound in BUCKETS_MS] + ['+Inf']
+    with _lock:
+        return {
+            route: {
+                'count': stats['count'],
+                'avg_ms': round(stats['total_ms'] / stats['count'], 3),
+                'avg_db_ms': round(stats['db_ms'] / stats['count'], 3),
+                'avg_render_ms': round(
+                    stats['render_ms'] / stats['count'], 3),
+                'avg_serialize_ms': round(
+                    stats['serialize_ms'] / stats['count'], 3),
+                'avg_queries': round(stats['queries'] / stats['count'], 2),
+                'histogram_ms': dict(zip(bounds, stats['buckets'])),
+            }
+            for route, stats in _routes.items()
+        }
+
+
+def reset_metrics():
+    with _lock:
+        _routes.clear()
+
+
+class RequestMetricsMiddleware:
+    """ Server-Timing с временем запроса, SQL, сериализации и рендеринга.
+
+    Включается добавлением в MIDDLEWARE, собранные гистограммы
+    отдаёт администраторам /api/v1/metrics/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._metrics_timer = timer
+        request._metrics_render = 0.0
+        request._metrics_serialize = 0.0
+        started = time.perf_counter()
+        with timed_queries(timer):
+            response = self.get_response(request)
+        total = (time.perf_counter() - started) * 1000
+        db = timer.duration * 1000
+        render = request._metrics_render * 1000
+        serialize = request._metrics_serialize * 1000
+        response['Server-Timing'] = ', '.join((
+            f'db;desc="{timer.count} queries";dur={db:.3f}',
+            f'serialize;dur={serialize:.3f}',
+            f'render;dur={render:.3f}',
+            f'total;dur={total:.3f}',
+        ))
+        match = request.resolver_match
+        if match is not None:
+            observe(f'{request.method} {match.route}',
+                    total, db, timer.count, render, serialize)
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def finish_render(response):
+            request._metrics_render += time.perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
@@ -0,0 +1,127 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+from api.cache import get_cache, get_model_state, is_primary_read, make_key
+
+
+def estimate_count(queryset):
+    """ Оценка числа строк по плану запроса; None, если её нет. """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """ Limit/offset, где общее число объектов не считается на каждой странице.
+
+    Число объектов кэшируется по адресу и параметрам фильтрации и
+    сбрасывается записью в `cache_models` представления. Если оценка
+    по плану запроса больше COUNT_ESTIMATE_THRESHOLD, отдаётся она.
+    """
+    page_query_params = ('limit', 'offset', 'cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_key(self, models):
+        versions, _ = get_model_state(models)
+        params = sorted(
+            (key, value)
+            for key, values in self.request.query_params.lists()
+            if key not in self.page_query_params for value in values)
+        digest = hashlib.sha1(repr((
+            self.request.path, params, versions)).encode('utf-8'))
+        return make_key('count', digest.hexdigest())
+
+    def get_count(self, queryset):
+        models = getattr(self.view, 'cache_models', ())
+        if (not isinstance(queryset, QuerySet) or not models
+                or not settings.API_CACHE['ENABLED']):
+            return self.count_objects(queryset)
+        cache = get_cache()
+        key = self.get_count_key(models)
+        count = cache.get(key)
+        if count is None:
+            count = self.count_objects(queryset)
+            # Число с отстающей реплики осталось бы под новой версией.
+            if is_primary_read():
+                cache.set(key, count, settings.API_CACHE['COUNT_TIMEOUT'])
+        return count
+
+    def count_objects(self, queryset):
+        threshold = settings.API_CACHE['COUNT_ESTIMATE_THRESHOLD']
+        if threshold and isinstance(queryset, QuerySet):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().get_count(queryset)
+
+
+class CursorOrLimitOffsetPagination(CachedCountPagination):
+    """ По умолчанию limit/offset, с параметром `cursor` — по ключу.
+
+    `?cursor=` открывает первую страницу по ключу, следующие доступны по
+    ссылкам `next`/`previous`; `limit` задаёт размер страницы в обоих режимах.
+    """
+    ordering = '-pub_date'
+    cursor_query_param = 'cursor'
+
+    def get_cursor_paginator(self):
+        paginator = CursorPagination()
+        paginator.ordering = self.ordering
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.page_size_query_param = self.limit_query_param
+        paginator.max_page_size = self.max_limit
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+class TitlePagination(CursorOrLimitOffsetPagination):
+    ordering = ('name', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Курсор сортирует по ordering и потерял бы порядок из `ids`.
+        if ('ids' in request.query_params
+                and self.cursor_query_param in request.query_params):
+            raise ValidationError({
+                self.cursor_query_param: 'Не используется вместе с `ids`.'})
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_limit(self, request):
+        """ Запрос по списку `ids` по умолчанию отдаётся одной страницей. """
+        ids = request.query_params.get('ids')
+        if ids and self.limit_query_param not in request.query_params:
+            return len(ids.split(','))
+        return super().get_limit(request)
@@ -0,0 +1,42 @@
+"""JSON-рендерер на orjson, если он установлен.
+
+Вывод совпадает с JSONRenderer DRF при настройках по умолчанию
+(UNICODE_JSON и COMPACT_JSON); в остальных случаях, а также без orjson
+работает рендерер DRF.
+"""
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+
+    def can_use_orjson(self):
+        return (orjson is not None and not self.ensure_ascii
+                and self.compact and self.encoder_class is JSONEncoder)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (not self.can_use_orjson() or self.get_indent(
+                accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Даты, Decimal, ленивые строки и прочее, чего нет в JSON,
+        # приводятся к виду тем же кодом, что и в DRF.
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        # Как и DRF, экранируем разделители строк для встраивания в JS.
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
@@ -1,8 +1,8 @@
 from django.conf import settings
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.serializers import IntegerField
-from rest_framework.exceptions import ValidationError
-from rest_framework.generics import get_object_or_404
 
 from reviews.models import (Category, Comment,
                             Genre, Review, Title, User)
@@ -46,8 +46,50 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    """ Список slug'ов, найденных одним запросом `slug__in`.
+
+    Обо всех ненайденных slug'ах сообщается сразу, повторы убираются.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        if not all(isinstance(slug, (str, int)) for slug in data):
+            child.fail('invalid')
+        slugs = list(dict.fromkeys(smart_str(slug) for slug in data))
+        found = {
+            smart_str(getattr(obj, child.slug_field)): obj
+            for obj in child.get_queryset().filter(
+                **{f'{child.slug_field}__in': slugs})
+        }
+        missing = [slug for slug in slugs if slug not in found]
+        if missing:
+            raise serializers.ValidationError([
+                child.error_messages['does_not_exist'].format(
+                    slug_name=child.slug_field, value=slug)
+                for slug in missing
+            ])
+        return [found[slug] for slug in slugs]
+
+
+class BatchSlugRelatedField(serializers.SlugRelatedField):
+    """ SlugRelatedField, который с many=True ищет все slug'и разом. """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+
 class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = BatchSlugRelatedField(
         many=True,
         read_only=False,
         queryset=Genre.objects.all(),
@@ -63,6 +105,20 @@ class TitleSerializer(serializers.ModelSerializer):
         )
 
 
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """ Произведение из пакета: slug'и проверяются разом для всего пакета. """
+    id = serializers.IntegerField(required=False)
+    category = serializers.SlugField(max_length=settings.LIMIT_SLUG)
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=settings.LIMIT_SLUG))
+
+    class Meta:
+        model = Title
+        fields = (
+            'id', 'name', 'description', 'category', 'genre', 'year',
+        )
+
+
 class ReadOnlyTitleSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
@@ -87,17 +143,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         exclude = ('title',)
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        user = self.context['request'].user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if Review.objects.filter(author=user, title=title).exists():
-            raise ValidationError('Вы не можете добавить более'
-                                  'одного отзыва на произведение')
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
@@ -108,3 +153,87 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         exclude = ('review',)
+
+
+class ValuesListSerializer:
+    """ Вывод списков из строк `.values()` без полей DRF на каждый объект.
+
+    Даёт тот же JSON, что и сериализатор из `model_serializer`, но
+    связанные данные (автор, категория) берутся JOIN в том же запросе.
+    """
+    values = ()
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def get_values(cls, queryset):
+        return queryset.prefetch_related(None).values(*cls.values)
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+
+class ReviewListSerializer(ValuesListSerializer):
+    values = ('id', 'author__username', 'text', 'pub_date', 'score')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'text': row['text'],
+            'pub_date': self.datetime_field.to_representation(
+                row['pub_date']),
+            'score': row['score'],
+        }
+
+
+class CommentListSerializer(ValuesListSerializer):
+    values = ('id', 'author__username', 'text', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'text': row['text'],
+            'pub_date': self.datetime_field.to_representation(
+                row['pub_date']),
+        }
+
+
+class TitleListSerializer(ValuesListSerializer):
+    values = ('id', 'name', 'description', 'category_id', 'category__name',
+              'category__slug', 'year', 'rating')
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        genres = {row['id']: [] for row in rows}
+        # Один запрос на жанры всей страницы в порядке Genre.Meta.ordering.
+        for title_id, name, slug in Title.genre.through.objects.filter(
+            title_id__in=genres
+        ).order_by(*(f'genre__{field}' for field in Genre._meta.ordering)
+                   ).values_list('title_id', 'genre__name', 'genre__slug'):
+            genres[title_id].append({'name': name, 'slug': slug})
+        self.genres = genres
+        return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        category = None
+        if row['category_id'] is not None:
+            category = {'name': row['category__name'],
+                        'slug': row['category__slug']}
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'description': row['description'],
+            'category': category,
+            'genre': self.genres[row['id']],
+            'year': row['year'],
+            'rating': row['rating'],
+        }
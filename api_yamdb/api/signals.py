@@ -0,0 +1,47 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from api.authentication import user_cache
+from api.cache import invalidate_model
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+CACHED_MODELS = (Category, Genre, Title, Review, Comment)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        invalidate_model(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_model(Title)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    user_cache.delete(instance.pk)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # Без обращения к полю: отложенное поле загружалось бы запросом.
+    instance._cached_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_names(sender, instance, created, **kwargs):
+    """ В кэшированных ответах от пользователя есть только имя автора. """
+    if not created and instance.username != instance._cached_username:
+        invalidate_model(User)
+    instance._cached_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_author(sender, instance, **kwargs):
+    invalidate_model(User)
@@ -0,0 +1,122 @@
+"""Ограничение частоты запросов к v1/auth/ по алгоритму token bucket.
+
+У каждого IP и каждого имени пользователя своё «ведро» на RATES токенов,
+которое равномерно наполняется за период; запрос забирает токен.
+Состояние ведра — пара (токены, время), поэтому в памяти процесса
+хранятся только недавно активные ключи, не больше MAX_KEYS. С STORE='cache'
+вёдра лежат в кэше Django и общие для всех процессов.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """ '5/min' -> (5, 60): размер ведра и время его полного наполнения. """
+    number, period = rate.split('/')
+    return int(number), PERIODS[period[0]]
+
+
+def take_token(state, capacity, period, now):
+    """ Новое состояние ведра и сколько секунд ждать, если токена нет. """
+    tokens, updated = state or (capacity, now)
+    refill = capacity / period
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / refill
+
+
+class MemoryBucketStore:
+    """ Вёдра в памяти процесса; сверх MAX_KEYS вытесняются самые давние. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def consume(self, key, capacity, period):
+        now = time.monotonic()
+        with self.lock:
+            state, wait = take_token(
+                self.buckets.pop(key, None), capacity, period, now)
+            self.buckets[key] = state
+            while len(self.buckets) > settings.AUTH_THROTTLE['MAX_KEYS']:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """ Вёдра в кэше Django; ведро истекает, когда наполнилось бы само. """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, period):
+        key = f'throttle:{key}'
+        state, wait = take_token(
+            self.cache.get(key), capacity, period, time.time())
+        self.cache.set(key, state, period)
+        return wait
+
+
+memory_store = MemoryBucketStore()
+
+
+def get_bucket_store():
+    if settings.AUTH_THROTTLE['STORE'] == 'cache':
+        return CacheBucketStore(settings.AUTH_THROTTLE['CACHE_ALIAS'])
+    return memory_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """ Throttle DRF с ведром на ключ из `get_bucket_key`. """
+    scope = None
+
+    def get_bucket_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        if not settings.AUTH_THROTTLE['ENABLED']:
+            return True
+        key = self.get_bucket_key(request)
+        if key is None:
+            return True
+        capacity, period = parse_rate(
+            settings.AUTH_THROTTLE['RATES'][self.scope])
+        wait = get_bucket_store().consume(
+            f'{self.scope}:{key}', capacity, period)
+        if wait:
+            self.retry_after = wait
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    scope = 'ip'
+
+    def get_bucket_key(self, request):
+        return self.get_ident(request)
+
+
+class AuthUsernameThrottle(TokenBucketThrottle):
+    scope = 'username'
+
+    def get_bucket_key(self, request):
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return username[:settings.LIMIT_USERNAME].lower()
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (CategoryViewSet, TitleViewSet,
                     GenreViewSet, api_get_token,
-                    api_signup, UsersViewSet,
+                    api_signup, api_cache_stats, api_metrics,
+                    UsersViewSet,
                     CommentViewSet, ReviewViewSet)
 
 
@@ -25,6 +26,8 @@ auth = [
 ]
 
 urlpatterns = [
+    path('v1/cache/stats/', api_cache_stats),
+    path('v1/metrics/', api_metrics),
     path('v1/', include(router.urls)),
     path('v1/auth/', include(auth))
 ]
@@ -1,28 +1,95 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from rest_framework import (filters, permissions,
                             status, viewsets, mixins)
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
-from django.db import models, IntegrityError
+from django.db import IntegrityError, transaction
 from django_filters.rest_framework import DjangoFilterBackend
 
+from api import cache, metrics
+from api.bulk import save_titles
+from api.authentication import RoleAccessToken
 from api.filters import TitleFilter
+from api.pagination import CursorOrLimitOffsetPagination, TitlePagination
 from api.permissions import (IsAdminModeratorOwnerOrReadOnly, IsAdminOnly,
                              IsAdminReadOnly)
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, GetTokenSerializer,
+from api.serializers import (CategorySerializer, CommentListSerializer,
+                             CommentSerializer, GenreSerializer,
+                             GetTokenSerializer, ReviewListSerializer,
                              ReviewSerializer, SignUpSerializer,
-                             TitleSerializer, UsersSerializer,
-                             ReadOnlyTitleSerializer, ValidationError,
+                             TitleListSerializer, TitleSerializer,
+                             UsersSerializer, ReadOnlyTitleSerializer,
                              UserEditSerializer)
-from reviews.models import Category, Genre, Review, Title, User
+from api.throttling import AuthIPThrottle, AuthUsernameThrottle
+from api_yamdb import db_routers
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleCounter, User)
+from reviews.outbox import queue_mail
+from reviews.search import search_title_ids
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class ReplicaReadsMixin:
+    """ Безопасные запросы читают с реплик, если пользователь не писал. """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        db_routers.use_replicas(
+            bool(db_routers.get_replicas())
+            and request.method in permissions.SAFE_METHODS
+            and not db_routers.is_sticky(request.user))
+
+    def dispatch(self, request, *args, **kwargs):
+        # finalize_response() не вызывается, если исключение не обработано:
+        # флаг сбрасывается здесь, чтобы не остаться на следующие запросы
+        # этого потока.
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            db_routers.use_replicas(False)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in permissions.SAFE_METHODS
+                and response.status_code < status.HTTP_400_BAD_REQUEST):
+            db_routers.stick_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class TimedSerializerMixin:
+    """ Сериализация ответа на чтение учитывается в метрике serialize. """
+
+    def get_serializer(self, *args, **kwargs):
+        with metrics.timed_serialization(self.request):
+            serializer = super().get_serializer(*args, **kwargs)
+            if 'data' not in kwargs:
+                # .data кэшируется в сериализаторе: здесь он и строится.
+                serializer.data
+        return serializer
+
+
+class ValuesListMixin:
+    """ Список строится из `.values()` через `list_serializer_class`. """
+    list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.list_serializer_class
+        rows = serializer_class.get_values(
+            self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        with metrics.timed_serialization(request):
+            data = serializer_class(rows if page is None else page).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class UsersViewSet(ReplicaReadsMixin, TimedSerializerMixin,
+                   viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UsersSerializer
     permission_classes = (IsAdminOnly,)
@@ -39,6 +106,9 @@ class UsersViewSet(viewsets.ModelViewSet):
         if not request.method == 'PATCH':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
+        # request.user может быть из кэша аутентификации: изменения ложатся
+        # на строку из БД, чтобы не записать обратно устаревшие поля.
+        user = get_object_or_404(User, pk=user.pk)
         serializer = self.get_serializer(
             user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -48,6 +118,7 @@ class UsersViewSet(viewsets.ModelViewSet):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([AuthIPThrottle, AuthUsernameThrottle])
 def api_get_token(request):
     serializer = GetTokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -56,13 +127,14 @@ def api_get_token(request):
     user = get_object_or_404(User, username=username)
     if default_token_generator.check_token(user, data['confirmation_code']):
         return Response(
-            {'token': str(AccessToken.for_user(user))},
+            {'token': str(RoleAccessToken.for_user(user))},
             status=status.HTTP_201_CREATED)
     raise ValidationError('Неверный код подтвержения!')
 
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([AuthIPThrottle, AuthUsernameThrottle])
 def api_signup(request):
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -79,24 +151,80 @@ def api_signup(request):
     code = default_token_generator.make_token(user)
     subject = 'Please confirm registration!'
     message = f'Здравствуйте, {username}! Ваш код подтверждения: {code}'
-    send_mail(subject, message, settings.SUPPORT_MAIL, [email])
+    queue_mail(subject, message, settings.SUPPORT_MAIL, [email])
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes([IsAdminOnly])
+def api_cache_stats(request):
+    return Response(cache.get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminOnly])
+def api_metrics(request):
+    return Response(metrics.get_metrics(), status=status.HTTP_200_OK)
+
+
+class TitleViewSet(ReplicaReadsMixin, TimedSerializerMixin,
+                   cache.CachedListMixin, cache.CachedRetrieveMixin,
+                   ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = TitleSerializer
-    queryset = Title.objects.annotate(rating=models.Avg("reviews__score"))
+    list_serializer_class = TitleListSerializer
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAdminReadOnly,)
+    pagination_class = TitlePagination
+    cache_models = (Title, Category, Genre, Review)
 
     def get_serializer_class(self):
-        if self.action in ('retrieve', 'list'):
+        if self.action in ('retrieve', 'list', 'search'):
             return ReadOnlyTitleSerializer
         return TitleSerializer
 
+    @action(methods=['get'], detail=False, url_path='search',
+            pagination_class=LimitOffsetPagination)
+    def search(self, request):
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            raise ValidationError({'q': 'Укажите текст для поиска.'})
+        title_ids = self.paginate_queryset(search_title_ids(query))
+        titles = self.get_queryset().in_bulk(title_ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in title_ids if pk in titles], many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['post'], detail=False, url_path='bulk',
+            permission_classes=(IsAdminOnly,))
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается список произведений.')
+        if len(items) > settings.LIMIT_BULK_TITLES:
+            raise ValidationError(
+                f'Не больше {settings.LIMIT_BULK_TITLES} произведений '
+                f'за запрос.')
+        result = save_titles(items)
+        if not result['created'] and not result['updated'] and items:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        if any('errors' in item for item in result['results']):
+            return Response(result, status=status.HTTP_200_OK)
+        return Response(result, status=status.HTTP_201_CREATED)
 
-class CommonGenreCategoryViewSet(mixins.CreateModelMixin,
+    @action(methods=['get'], detail=True, url_path='stats')
+    def stats(self, request, pk=None):
+        title = get_object_or_404(Title.objects.only('rating'), pk=pk)
+        return Response(
+            {'id': title.pk, 'rating': title.rating,
+             **TitleCounter.get_stats(title.pk)})
+
+
+class CommonGenreCategoryViewSet(ReplicaReadsMixin, TimedSerializerMixin,
+                                 cache.CachedListMixin,
+                                 mixins.CreateModelMixin,
                                  mixins.ListModelMixin,
                                  mixins.DestroyModelMixin,
                                  viewsets.GenericViewSet):
@@ -109,37 +237,66 @@ class CommonGenreCategoryViewSet(mixins.CreateModelMixin,
 class GenreViewSet(CommonGenreCategoryViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
 class CategoryViewSet(CommonGenreCategoryViewSet):
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
+    cache_models = (Category,)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadsMixin, TimedSerializerMixin,
+                    cache.CachedListMixin, cache.CachedRetrieveMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    list_serializer_class = ReviewListSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    pagination_class = CursorOrLimitOffsetPagination
+    cache_models = (Title, Review, User)
 
-    def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
 
-        return title.reviews.all()
+    def get_queryset(self):
+        if self.detail:
+            # Отдельно искать произведение не нужно: без него отзыв
+            # всё равно не найдётся и вернётся 404.
+            return Review.objects.select_related('author').filter(
+                title_id=self.kwargs.get('title_id'))
+        return self.title.reviews.all()
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            raise ValidationError('Вы не можете добавить более '
+                                  'одного отзыва на произведение')
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadsMixin, TimedSerializerMixin,
+                     ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    list_serializer_class = CommentListSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    pagination_class = CursorOrLimitOffsetPagination
+    cache_models = (Review, Comment)
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review,
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        if self.detail:
+            return Comment.objects.select_related('author').filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id'))
+        return self.review.comments.all()
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
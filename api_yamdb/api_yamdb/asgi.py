@@ -1,7 +1,19 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+class AsyncReadsASGIRequest(ASGIRequest):
+    # Маршруты с асинхронным чтением, см. api.async_views
+    urlconf = 'api_yamdb.urls_async'
+
+
+class AsyncReadsASGIHandler(ASGIHandler):
+    request_class = AsyncReadsASGIRequest
+
+
+django.setup(set_prefix=False)
+application = AsyncReadsASGIHandler()
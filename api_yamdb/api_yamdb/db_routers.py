@@ -0,0 +1,68 @@
+"""Чтение с реплик БД.
+
+Viewset'ы API включают чтение с реплик на время безопасного запроса
+(api.views.ReplicaReadsMixin); остальные запросы, запись и миграции идут
+в `default`. После записи пользователь READ_REPLICAS['STICKY_SECONDS']
+секунд читает с основной базы, чтобы видеть свои изменения, даже если
+реплика ещё не догнала её.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+state = threading.local()
+
+
+def get_replicas():
+    return settings.READ_REPLICAS['ALIASES']
+
+
+def use_replicas(enabled):
+    """ Включает чтение с реплик в текущем потоке. """
+    state.replica_reads = enabled
+
+
+def replicas_in_use():
+    """ Читает ли текущий поток с реплик. """
+    return bool(get_replicas()) and getattr(state, 'replica_reads', False)
+
+
+def get_sticky_key(user):
+    return f'replica:sticky:{user.pk}'
+
+
+def stick_to_primary(user):
+    """ Следующие чтения пользователя идут в основную базу. """
+    if get_replicas() and user.is_authenticated:
+        caches[settings.READ_REPLICAS['CACHE_ALIAS']].set(
+            get_sticky_key(user), True,
+            settings.READ_REPLICAS['STICKY_SECONDS'])
+
+
+def is_sticky(user):
+    return user.is_authenticated and caches[
+        settings.READ_REPLICAS['CACHE_ALIAS']].get(
+            get_sticky_key(user), False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replicas_in_use():
+            return random.choice(get_replicas())
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Без явного ответа Django пишет туда, откуда объект прочитан.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in get_replicas():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
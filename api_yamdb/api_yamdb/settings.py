@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -38,6 +39,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+if os.getenv('REQUEST_METRICS') == 'True':
+    MIDDLEWARE.insert(0, 'api.metrics.RequestMetricsMiddleware')
 
 ROOT_URLCONF = 'api_yamdb.urls'
 
@@ -60,15 +63,116 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Потоки, в которых под ASGI выполняются GET-запросы к API
+ASYNC_READ_WORKERS = int(os.getenv('ASYNC_READ_WORKERS', 8))
+
 
 # Database
 
-DATABASES = {
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+if DB_ENGINE == 'django.db.backends.postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Постоянные соединения: не подключаться заново на каждый запрос
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            # Проверять соединение перед запросом (reviews/db.py)
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Сколько секунд ждать снятия блокировки записи
+                'timeout': 20,
+            },
+        }
+    }
+
+# Реплики только для чтения: через запятую имена файлов SQLite или хосты
+# PostgreSQL; остальные параметры берутся из default.
+READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5)),
+    'CACHE_ALIAS': 'default',
+}
+for number, replica in enumerate(
+        filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST' if DB_ENGINE == 'django.db.backends.postgresql' else 'NAME':
+            replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS['ALIASES'].append(alias)
+
+DATABASE_ROUTERS = ['api_yamdb.db_routers.ReplicaRouter']
+
+# Применяются к каждому новому соединению с SQLite
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+
+# Cache
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
     }
 }
+if os.getenv('CACHE_FILE_PATH'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_FILE_PATH'),
+    }
+# Версии данных для ETag и ключей кэша должны быть общими для всех
+# процессов, иначе процесс не узнает о записи, сделанной другим.
+CACHES['api_state'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.getenv(
+        'API_STATE_CACHE_PATH',
+        os.path.join(tempfile.gettempdir(), 'api_yamdb_state')),
+}
+
+API_CACHE = {
+    'ENABLED': os.getenv('API_CACHE_ENABLED', 'True') == 'True',
+    'ALIAS': 'default',
+    # Версии моделей: общий для всех процессов кэш.
+    'STATE_ALIAS': 'api_state',
+    'KEY_PREFIX': 'api',
+    'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', 60 * 5)),
+    # Число объектов в списках с пагинацией.
+    'COUNT_TIMEOUT': int(os.getenv('API_COUNT_TIMEOUT', 60 * 60)),
+    # 0 — всегда точный COUNT(*); иначе на PostgreSQL выше порога
+    # отдаётся оценка из плана запроса.
+    'COUNT_ESTIMATE_THRESHOLD': int(
+        os.getenv('API_COUNT_ESTIMATE_THRESHOLD', 0)),
+}
+
+
+# Full-text search
+
+SEARCH = {
+    'MAX_RESULTS': 1000,
+    'POSTGRESQL_CONFIG': 'russian',
+}
 
 
 # Password validation
@@ -110,12 +214,24 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.LimitOffsetPagination',
+        'api.pagination.CachedCountPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # Число доверенных прокси перед приложением. При 0 адрес клиента для
+    # ограничения запросов — REMOTE_ADDR, а X-Forwarded-For не читается.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
@@ -123,12 +239,38 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Пользователи, загруженные JWT-аутентификацией, живут в памяти процесса
+AUTH_USER_CACHE = {
+    'TIMEOUT': int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 30)),
+    'MAX_SIZE': 10000,
+}
+
+AUTH_THROTTLE = {
+    'ENABLED': os.getenv('AUTH_THROTTLE_ENABLED', 'True') == 'True',
+    # memory — вёдра в памяти процесса, cache — в кэше CACHE_ALIAS.
+    'STORE': os.getenv('AUTH_THROTTLE_STORE', 'memory'),
+    'CACHE_ALIAS': 'default',
+    'MAX_KEYS': 100000,
+    'RATES': {
+        'ip': os.getenv('AUTH_THROTTLE_IP_RATE', '30/min'),
+        'username': os.getenv('AUTH_THROTTLE_USERNAME_RATE', '10/min'),
+    },
+}
+
 SUPPORT_MAIL = 'support@yamdb.com'
 
 AUTH_USER_MODEL = 'reviews.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# С включённой очередью письма отправляет команда send_emails
+EMAIL_OUTBOX = {
+    'ENABLED': os.getenv('EMAIL_OUTBOX', 'True') == 'True',
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 30,
+    'MAX_RETRY_DELAY': 60 * 60,
+    'LOCK_TIMEOUT': 60 * 5,
+}
 CSV_FILE_PATH = os.path.join(BASE_DIR, 'static/data')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
@@ -151,6 +293,10 @@ LIMIT_SLUG = 50
 
 LEN_STR = 20
 
+LIMIT_BATCH_IDS = 500
+
+LIMIT_BULK_TITLES = 500
+
 MIN_VALUE = 1
 
 MAX_VALUE = 10
@@ -0,0 +1,5 @@
+"""URLconf для ASGI: те же маршруты, чтение API в пуле потоков."""
+from api.async_views import with_async_reads
+from api_yamdb.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = with_async_reads(sync_urlpatterns)
@@ -0,0 +1,180 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, transaction
+
+from api.cache import bump_model_version
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleCounter, User)
+
+CSV_MODELS = {
+    'category.csv': Category,
+    'genre.csv': Genre,
+    'titles.csv': Title,
+    'genre_title.csv': Title.genre.through,
+    'users.csv': User,
+    'review.csv': Review,
+    'comments.csv': Comment,
+}
+
+
+def sort_by_dependencies(files):
+    """ Порядок загрузки: таблица идёт после таблиц, на которые ссылается. """
+    models = {CSV_MODELS[filename]: filename for filename in files}
+    ordered = []
+
+    def visit(model, path=()):
+        if model in path:
+            raise CommandError(
+                f'Циклическая зависимость: {model._meta.label}')
+        if models[model] in ordered:
+            return
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if field.is_relation and related in models and related != model:
+                visit(related, path + (model,))
+        ordered.append(models[model])
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def get_csv_fields(model, header):
+    """ Сопоставляет колонки .csv полям модели: `author` -> `author_id`. """
+    fields = []
+    for column in header:
+        try:
+            field = model._meta.get_field(column)
+        except FieldDoesNotExist:
+            field = next(
+                (field for field in model._meta.concrete_fields
+                 if field.attname == column), None)
+        if field is None or not field.concrete:
+            raise CommandError(
+                f'{model._meta.label}: неизвестная колонка {column}')
+        fields.append(field)
+    return fields
+
+
+def to_python(field, value):
+    if value == '':
+        return None if field.null else field.get_default()
+    if field.is_relation:
+        field = field.target_field
+    return field.to_python(value)
+
+
+@contextmanager
+def keep_auto_dates(model):
+    """ Не даёт auto_now_add затереть даты из файла при вставке. """
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из .csv файлов в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*',
+            help='Файлы для загрузки; по умолчанию все известные: '
+                 + ', '.join(CSV_MODELS))
+        parser.add_argument(
+            '--path', default=settings.CSV_FILE_PATH,
+            help='Каталог с .csv файлами.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк, читаемых и вставляемых за раз.')
+        parser.add_argument(
+            '--database', default='default',
+            help='Алиас базы данных из DATABASES.')
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Падать на уже существующих строках, а не пропускать их.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        unknown = set(options['files']) - set(CSV_MODELS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные файлы: {", ".join(sorted(unknown))}')
+        files = options['files'] or [
+            filename for filename in CSV_MODELS
+            if os.path.exists(os.path.join(options['path'], filename))
+        ]
+        loaded = []
+        for filename in sort_by_dependencies(files):
+            model = CSV_MODELS[filename]
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                raise CommandError(f'Файл {path} не найден.')
+            rows, seconds = self.load(model, path, options)
+            loaded.append(model)
+            speed = rows / seconds if seconds else rows
+            self.stdout.write(
+                f'{filename}: {rows} строк за {seconds:.2f} с '
+                f'({speed:.0f} строк/с)')
+        self.reset_sequences(loaded, options['database'])
+        titles = Title.objects.using(options['database'])
+        if Review in loaded:
+            Title.recalculate_ratings(titles)
+        if Review in loaded or Comment in loaded:
+            TitleCounter.recalculate(titles)
+        self.invalidate_cache(loaded)
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
+
+    def load(self, model, path, options):
+        database = options['database']
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        rows = 0
+        with open(path, newline='', encoding='utf-8') as csv_file, \
+                transaction.atomic(using=database), keep_auto_dates(model):
+            reader = csv.reader(csv_file)
+            fields = get_csv_fields(model, next(reader))
+            while True:
+                chunk = list(islice(reader, batch_size))
+                if not chunk:
+                    break
+                model.objects.using(database).bulk_create(
+                    (model(**{field.attname: to_python(field, value)
+                              for field, value in zip(fields, row)})
+                     for row in chunk),
+                    batch_size=batch_size,
+                    ignore_conflicts=not options['strict'])
+                rows += len(chunk)
+        return rows, time.perf_counter() - started
+
+    def invalidate_cache(self, models):
+        """ bulk_create не шлёт сигналов: версии кэша API меняются здесь. """
+        models = {Title if model is Title.genre.through else model
+                  for model in models}
+        if Review in models:
+            models.add(Title)
+        for model in models:
+            bump_model_version(model)
+
+    def reset_sequences(self, models, database):
+        """ Сдвигает автоинкремент за загруженные id (PostgreSQL, Oracle). """
+        connection = connections[database]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
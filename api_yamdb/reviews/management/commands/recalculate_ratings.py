@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_model_version
+from reviews.models import Title, TitleCounter
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённые рейтинги и счётчики произведений '
+            'по отзывам и комментариям.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids', nargs='*', type=int,
+            help='id произведений; по умолчанию пересчитываются все.')
+
+    def handle(self, *args, **options):
+        queryset = Title.objects.all()
+        if options['title_ids']:
+            queryset = queryset.filter(pk__in=options['title_ids'])
+        updated = Title.recalculate_ratings(queryset)
+        counters = TitleCounter.recalculate(queryset)
+        # update() не шлёт сигналов: ответы с рейтингом сбрасываются здесь.
+        bump_model_version(Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано рейтингов: {updated}, счётчиков: {counters}'))
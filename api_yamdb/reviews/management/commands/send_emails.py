@@ -0,0 +1,60 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.outbox import claim_batch, deliver
+
+
+def deliver_in_thread(emails):
+    try:
+        return deliver(emails)
+    finally:
+        # У каждого потока пула своё соединение с БД.
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди OutgoingEmail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Количество потоков, отправляющих письма.')
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Писем на одно соединение с почтовым сервером.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза в секундах, когда очередь пуста.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершиться.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError(
+                '--workers и --batch-size должны быть больше нуля.')
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                sent = self.send_pending(pool, options)
+                if sent is None and options['once']:
+                    break
+                if sent is None:
+                    time.sleep(options['interval'])
+
+    def send_pending(self, pool, options):
+        """ До `workers` пачек параллельно; None, если очередь пуста. """
+        batches = []
+        for _ in range(options['workers']):
+            emails = claim_batch(options['batch_size'])
+            if not emails:
+                break
+            batches.append(emails)
+        if not batches:
+            return None
+        sent = sum(pool.map(deliver_in_thread, batches))
+        total = sum(len(emails) for emails in batches)
+        self.stdout.write(f'Отправлено писем: {sent} из {total}')
+        return sent
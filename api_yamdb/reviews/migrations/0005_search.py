@@ -0,0 +1,86 @@
+# SQLite пересоздаёт таблицу при изменении её полей в миграциях, а вместе
+# с таблицей пропадают и триггеры: такие миграции reviews_title и
+# reviews_review должны создавать триггеры поиска заново.
+from django.conf import settings
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    "CREATE VIRTUAL TABLE reviews_title_fts USING fts5("
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE reviews_review_fts USING fts5("
+    "text, content='reviews_review', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title "
+    "BEGIN INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title "
+    "BEGIN INSERT INTO reviews_title_fts("
+    "reviews_title_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER reviews_title_fts_update "
+    "AFTER UPDATE OF name, description ON reviews_title "
+    "BEGIN INSERT INTO reviews_title_fts("
+    "reviews_title_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER reviews_review_fts_insert AFTER INSERT ON reviews_review "
+    "BEGIN INSERT INTO reviews_review_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER reviews_review_fts_delete AFTER DELETE ON reviews_review "
+    "BEGIN INSERT INTO reviews_review_fts(reviews_review_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER reviews_review_fts_update "
+    "AFTER UPDATE OF text ON reviews_review "
+    "BEGIN INSERT INTO reviews_review_fts(reviews_review_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO reviews_review_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+    "INSERT INTO reviews_review_fts(reviews_review_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = tuple(
+    f'DROP TRIGGER reviews_{table}_fts_{event}'
+    for table in ('title', 'review')
+    for event in ('insert', 'delete', 'update')
+) + (
+    'DROP TABLE reviews_title_fts',
+    'DROP TABLE reviews_review_fts',
+)
+POSTGRESQL_FORWARD = (
+    "CREATE INDEX reviews_title_search ON reviews_title USING GIN "
+    "(to_tsvector('{config}', name || ' ' || description))",
+    "CREATE INDEX reviews_review_search ON reviews_review USING GIN "
+    "(to_tsvector('{config}', text))",
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX reviews_title_search',
+    'DROP INDEX reviews_review_search',
+)
+
+
+def run_for_vendor(sqlite, postgresql):
+    def run(apps, schema_editor):
+        statements = {
+            'sqlite': sqlite,
+            'postgresql': postgresql,
+        }.get(schema_editor.connection.vendor, ())
+        config = settings.SEARCH['POSTGRESQL_CONFIG']
+        for sql in statements:
+            schema_editor.execute(sql.format(config=config))
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(SQLITE_FORWARD, POSTGRESQL_FORWARD),
+            run_for_vendor(SQLITE_BACKWARD, POSTGRESQL_BACKWARD),
+        ),
+    ]
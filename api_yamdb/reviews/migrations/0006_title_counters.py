@@ -0,0 +1,58 @@
+# Generated by Django 3.2 on 2026-10-18 20:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    TitleCounter = apps.get_model('reviews', 'TitleCounter')
+    reviews = Review.objects.order_by()
+    counters = [
+        TitleCounter(title_id=row['title_id'], name=f"score_{row['score']}",
+                     value=row['total'])
+        for row in reviews.values('title_id', 'score').annotate(
+            total=models.Count('pk'))
+    ]
+    counters += [
+        TitleCounter(title_id=row['title_id'], name='reviews',
+                     value=row['total'])
+        for row in reviews.values('title_id').annotate(
+            total=models.Count('pk'))
+    ]
+    counters += [
+        TitleCounter(title_id=row['review__title_id'], name='comments',
+                     value=row['total'])
+        for row in Comment.objects.order_by().values(
+            'review__title_id').annotate(total=models.Count('pk'))
+    ]
+    TitleCounter.objects.bulk_create(counters, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='Счётчик')),
+                ('value', models.IntegerField(default=0, verbose_name='Значение')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counters', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Счётчик произведения',
+                'verbose_name_plural': 'Счётчики произведений',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlecounter',
+            constraint=models.UniqueConstraint(fields=('title', 'name'), name='unique_title_counter'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,139 @@
+# Счётчики reviews_titlecounter ведут триггеры: прибавление — один
+# INSERT ... ON CONFLICT DO UPDATE без гонок между процессами, вычитание —
+# UPDATE, который не создаёт строк заново (счётчики удаляемого произведения
+# не должны возвращаться). SQLite пересоздаёт таблицу при изменении её полей
+# в миграциях, а вместе с таблицей пропадают и триггеры: такие миграции
+# reviews_review и reviews_comment должны создавать триггеры заново.
+from django.db import migrations
+
+SQLITE_ADD = (
+    "INSERT INTO reviews_titlecounter (title_id, name, value) {values} "
+    "ON CONFLICT (title_id, name) DO UPDATE "
+    "SET value = reviews_titlecounter.value + excluded.value; "
+)
+SQLITE_ADD_REVIEW = SQLITE_ADD.format(
+    values="VALUES (new.title_id, 'reviews', 1), "
+           "(new.title_id, 'score_' || new.score, 1)")
+SQLITE_SUBTRACT_REVIEW = (
+    "UPDATE reviews_titlecounter SET value = value - 1 "
+    "WHERE title_id = old.title_id "
+    "AND name IN ('reviews', 'score_' || old.score); "
+)
+SQLITE_FORWARD = (
+    "CREATE TRIGGER reviews_review_counters_insert "
+    "AFTER INSERT ON reviews_review "
+    f"BEGIN {SQLITE_ADD_REVIEW}END",
+    "CREATE TRIGGER reviews_review_counters_delete "
+    "AFTER DELETE ON reviews_review "
+    f"BEGIN {SQLITE_SUBTRACT_REVIEW}END",
+    # Отзыв, перенесённый к другому произведению, уносит свои комментарии.
+    "CREATE TRIGGER reviews_review_counters_update "
+    "AFTER UPDATE OF title_id, score ON reviews_review "
+    "WHEN old.title_id != new.title_id OR old.score != new.score "
+    f"BEGIN {SQLITE_SUBTRACT_REVIEW}{SQLITE_ADD_REVIEW}"
+    "UPDATE reviews_titlecounter SET value = value - ("
+    "SELECT COUNT(*) FROM reviews_comment WHERE review_id = new.id) "
+    "WHERE title_id = old.title_id AND name = 'comments'; "
+    + SQLITE_ADD.format(
+        values="SELECT new.title_id, 'comments', COUNT(*) "
+               "FROM reviews_comment WHERE review_id = new.id")
+    + "END",
+    "CREATE TRIGGER reviews_comment_counters_insert "
+    "AFTER INSERT ON reviews_comment "
+    "BEGIN " + SQLITE_ADD.format(
+        values="SELECT title_id, 'comments', 1 FROM reviews_review "
+               "WHERE id = new.review_id")
+    + "END",
+    "CREATE TRIGGER reviews_comment_counters_delete "
+    "AFTER DELETE ON reviews_comment "
+    "BEGIN UPDATE reviews_titlecounter SET value = value - 1 "
+    "WHERE name = 'comments' AND title_id = ("
+    "SELECT title_id FROM reviews_review WHERE id = old.review_id); END",
+)
+SQLITE_BACKWARD = tuple(
+    f'DROP TRIGGER reviews_{table}_counters_{event}'
+    for table, events in (('review', ('insert', 'delete', 'update')),
+                          ('comment', ('insert', 'delete')))
+    for event in events
+)
+POSTGRESQL_ADD = (
+    "INSERT INTO reviews_titlecounter (title_id, name, value) {values} "
+    "ON CONFLICT (title_id, name) DO UPDATE "
+    "SET value = reviews_titlecounter.value + EXCLUDED.value;"
+)
+POSTGRESQL_FORWARD = (
+    "CREATE FUNCTION reviews_review_counters() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_OP = 'UPDATE' AND OLD.title_id = NEW.title_id "
+    "AND OLD.score = NEW.score THEN RETURN NULL; END IF; "
+    "IF TG_OP IN ('UPDATE', 'DELETE') THEN "
+    "UPDATE reviews_titlecounter SET value = value - 1 "
+    "WHERE title_id = OLD.title_id "
+    "AND name IN ('reviews', 'score_' || OLD.score); "
+    "END IF; "
+    "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+    + POSTGRESQL_ADD.format(
+        values="VALUES (NEW.title_id, 'reviews', 1), "
+               "(NEW.title_id, 'score_' || NEW.score, 1)")
+    + " END IF; "
+    "IF TG_OP = 'UPDATE' AND OLD.title_id != NEW.title_id THEN "
+    "UPDATE reviews_titlecounter SET value = value - ("
+    "SELECT COUNT(*) FROM reviews_comment WHERE review_id = NEW.id) "
+    "WHERE title_id = OLD.title_id AND name = 'comments'; "
+    + POSTGRESQL_ADD.format(
+        values="SELECT NEW.title_id, 'comments', COUNT(*) "
+               "FROM reviews_comment WHERE review_id = NEW.id")
+    + " END IF; "
+    "RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER reviews_review_counters "
+    "AFTER INSERT OR DELETE OR UPDATE OF title_id, score ON reviews_review "
+    "FOR EACH ROW EXECUTE PROCEDURE reviews_review_counters()",
+    "CREATE FUNCTION reviews_comment_counters() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_OP = 'INSERT' THEN "
+    + POSTGRESQL_ADD.format(
+        values="SELECT title_id, 'comments', 1 FROM reviews_review "
+               "WHERE id = NEW.review_id")
+    + " ELSE "
+    "UPDATE reviews_titlecounter SET value = value - 1 "
+    "WHERE name = 'comments' AND title_id = ("
+    "SELECT title_id FROM reviews_review WHERE id = OLD.review_id); "
+    "END IF; "
+    "RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER reviews_comment_counters "
+    "AFTER INSERT OR DELETE ON reviews_comment "
+    "FOR EACH ROW EXECUTE PROCEDURE reviews_comment_counters()",
+)
+POSTGRESQL_BACKWARD = (
+    'DROP TRIGGER reviews_review_counters ON reviews_review',
+    'DROP FUNCTION reviews_review_counters()',
+    'DROP TRIGGER reviews_comment_counters ON reviews_comment',
+    'DROP FUNCTION reviews_comment_counters()',
+)
+
+
+def run_for_vendor(sqlite, postgresql):
+    def run(apps, schema_editor):
+        statements = {
+            'sqlite': sqlite,
+            'postgresql': postgresql,
+        }.get(schema_editor.connection.vendor, ())
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(SQLITE_FORWARD, POSTGRESQL_FORWARD),
+            run_for_vendor(SQLITE_BACKWARD, POSTGRESQL_BACKWARD),
+        ),
+    ]
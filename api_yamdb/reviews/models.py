@@ -1,7 +1,9 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
 
 from .validators import validate_username, validate_year
 
@@ -99,16 +101,74 @@ class Title(models.Model):
         validators=[validate_year],
         db_index=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name'], name='title_name'),
+            models.Index(fields=['category', 'name'],
+                         name='title_category_name'),
+        ]
 
     def __str__(self):
         return self.name[:settings.LEN_STR]
 
+    @staticmethod
+    def rating_expression(rating_sum, rating_count):
+        """ Integer average of the scores, None for a title without them. """
+        return models.ExpressionWrapper(
+            rating_sum / NullIf(rating_count, 0),
+            output_field=models.PositiveSmallIntegerField())
+
+    @classmethod
+    def change_rating(cls, title_id, score_delta, count_delta):
+        """ Shift the stored rating of a title by the given deltas. """
+        rating_sum = models.F('rating_sum') + score_delta
+        rating_count = models.F('rating_count') + count_delta
+        cls.objects.filter(pk=title_id).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=cls.rating_expression(rating_sum, rating_count),
+        )
+
+    @classmethod
+    def recalculate_ratings(cls, queryset=None):
+        """ Rebuild stored ratings from the reviews table. """
+        if queryset is None:
+            queryset = cls.objects.all()
+        reviews = Review.objects.filter(
+            title=models.OuterRef('pk')).order_by().values('title')
+        updated = queryset.update(
+            rating_sum=Coalesce(models.Subquery(
+                reviews.annotate(total=models.Sum('score')).values('total')),
+                0),
+            rating_count=Coalesce(models.Subquery(
+                reviews.annotate(total=models.Count('pk')).values('total')),
+                0),
+        )
+        queryset.update(rating=cls.rating_expression(
+            models.F('rating_sum'), models.F('rating_count')))
+        return updated
+
 
 class CommonReviewCommentModel(models.Model):
     """ Abstract model for storing common data. """
@@ -161,6 +221,10 @@ class Review(CommonReviewCommentModel):
                 name='unique_review'
             ),
         ]
+        indexes = [
+            models.Index(fields=['title', 'pub_date'],
+                         name='review_title_pub_date'),
+        ]
 
 
 class Comment(CommonReviewCommentModel):
@@ -175,3 +239,131 @@ class Comment(CommonReviewCommentModel):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(fields=['review', 'pub_date'],
+                         name='comment_review_pub_date'),
+        ]
+
+
+class TitleCounter(models.Model):
+    """ Counters of reviews, scores and comments of a title.
+
+    Kept up to date by database triggers on review and comment writes
+    (migration 0007), so the statistics of a title are read without
+    COUNT/GROUP BY.
+    """
+    REVIEWS = 'reviews'
+    COMMENTS = 'comments'
+
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        related_name='counters'
+    )
+    name = models.CharField(
+        verbose_name='Счётчик', max_length=settings.LIMIT_SLUG)
+    value = models.IntegerField(verbose_name='Значение', default=0)
+
+    class Meta:
+        verbose_name = 'Счётчик произведения'
+        verbose_name_plural = 'Счётчики произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'name'],
+                name='unique_title_counter'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.name} = {self.value}'
+
+    @staticmethod
+    def score_name(score):
+        return f'score_{score}'
+
+    @classmethod
+    def get_stats(cls, title_id):
+        """ Review count, score distribution and comment count. """
+        counters = dict(cls.objects.filter(title_id=title_id).values_list(
+            'name', 'value'))
+        return {
+            'reviews': counters.get(cls.REVIEWS, 0),
+            'comments': counters.get(cls.COMMENTS, 0),
+            'scores': {
+                str(score): counters.get(cls.score_name(score), 0)
+                for score in range(settings.MIN_VALUE, settings.MAX_VALUE + 1)
+            },
+        }
+
+    @classmethod
+    def recalculate(cls, titles=None):
+        """ Rebuild the counters of the titles from reviews and comments. """
+        if titles is None:
+            titles = Title.objects.all()
+        database = titles.db
+        title_ids = titles.values('pk')
+        reviews = Review.objects.using(database).filter(
+            title__in=title_ids).order_by()
+        comments = Comment.objects.using(database).filter(
+            review__title__in=title_ids).order_by()
+        counters = []
+        for row in reviews.values('title_id', 'score').annotate(
+                total=models.Count('pk')):
+            counters.append(cls(title_id=row['title_id'],
+                                name=cls.score_name(row['score']),
+                                value=row['total']))
+        for row in reviews.values('title_id').annotate(
+                total=models.Count('pk')):
+            counters.append(cls(title_id=row['title_id'], name=cls.REVIEWS,
+                                value=row['total']))
+        for row in comments.values('review__title_id').annotate(
+                total=models.Count('pk')):
+            counters.append(cls(title_id=row['review__title_id'],
+                                name=cls.COMMENTS, value=row['total']))
+        with transaction.atomic(using=database):
+            cls.objects.using(database).filter(title__in=title_ids).delete()
+            cls.objects.using(database).bulk_create(counters, batch_size=500)
+        return len(counters)
+
+
+class OutgoingEmail(models.Model):
+    """ Outbox of emails delivered by the send_emails command. """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.CharField(
+        verbose_name='Тема', max_length=settings.LIMIT_NAME)
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        verbose_name='Отправитель', max_length=settings.LIMIT_EMAIL)
+    to = models.EmailField(
+        verbose_name='Получатель', max_length=settings.LIMIT_EMAIL)
+    status = models.CharField(
+        verbose_name='Статус', choices=STATUSES, default=PENDING,
+        max_length=settings.LIMIT_ROLE)
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки', default=0)
+    next_attempt = models.DateTimeField(
+        verbose_name='Следующая попытка', default=timezone.now)
+    last_error = models.TextField(verbose_name='Ошибка', blank=True)
+    created = models.DateTimeField(
+        verbose_name='Создано', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Письма'
+        ordering = ('pk',)
+        indexes = [
+            models.Index(fields=['status', 'next_attempt'],
+                         name='outgoing_email_queue'),
+        ]
+
+    def __str__(self):
+        return f'{self.to}: {self.subject[:settings.LEN_STR]}'
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """ Кладёт письмо в очередь или, если очередь выключена, отправляет. """
+    if not settings.EMAIL_OUTBOX['ENABLED']:
+        return send_mail(subject, message, from_email, recipient_list)
+    OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(subject=subject, message=message,
+                      from_email=from_email, to=recipient)
+        for recipient in recipient_list)
+    return len(recipient_list)
+
+
+def claim_batch(batch_size):
+    """ Забирает письма на отправку.
+
+    На время отправки следующая попытка сдвигается на LOCK_TIMEOUT:
+    другие обработчики эти письма не возьмут, а письма упавшего
+    обработчика вернутся в очередь сами.
+    """
+    now = timezone.now()
+    ids = list(OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING, next_attempt__lte=now,
+    ).values_list('pk', flat=True)[:batch_size])
+    locked_until = now + timedelta(
+        seconds=settings.EMAIL_OUTBOX['LOCK_TIMEOUT'])
+    claimed = OutgoingEmail.objects.filter(
+        pk__in=ids, status=OutgoingEmail.PENDING, next_attempt__lte=now)
+    claimed.update(next_attempt=locked_until)
+    return list(OutgoingEmail.objects.filter(
+        pk__in=ids, next_attempt=locked_until))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX['RETRY_DELAY'] * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX['MAX_RETRY_DELAY']))
+
+
+def mark_failed(email, error):
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_OUTBOX['MAX_ATTEMPTS']:
+        email.status = OutgoingEmail.FAILED
+    else:
+        email.next_attempt = timezone.now() + retry_delay(email.attempts)
+
+
+def deliver(emails):
+    """ Отправляет пачку писем через одно соединение с почтовым сервером. """
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            email.attempts += 1
+            mark_failed(email, error)
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'status', 'next_attempt', 'last_error'))
+        return sent
+    try:
+        for email in emails:
+            email.attempts += 1
+            try:
+                connection.send_messages([EmailMessage(
+                    email.subject, email.message, email.from_email,
+                    [email.to])])
+            except Exception as error:
+                mark_failed(email, error)
+            else:
+                email.status = OutgoingEmail.SENT
+                email.last_error = ''
+                sent += 1
+    finally:
+        connection.close()
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'status', 'next_attempt', 'last_error'))
+    return sent
@@ -0,0 +1,92 @@
+"""Полнотекстовый поиск по произведениям и текстам отзывов.
+
+В SQLite таблицы FTS5 заполняют триггеры, в PostgreSQL работают
+GIN-индексы по выражениям tsvector; и то и другое создаёт миграция 0005.
+На других СУБД поиск идёт через icontains.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, models, router
+
+from .models import Review, Title
+
+TERM = re.compile(r'\w+')
+
+# Каждая таблица отдаёт не больше `limit` лучших совпадений до объединения:
+# частое слово не тянет в GROUP BY все подходящие отзывы.
+SQLITE_SEARCH = '''
+    SELECT title_id FROM (
+        SELECT * FROM (
+            SELECT rowid AS title_id,
+                   bm25(reviews_title_fts, 10.0, 1.0) AS rank
+            FROM reviews_title_fts WHERE reviews_title_fts MATCH %s
+            ORDER BY rank LIMIT %s
+        )
+        UNION ALL
+        SELECT review.title_id, found.rank FROM (
+            SELECT rowid, bm25(reviews_review_fts) AS rank
+            FROM reviews_review_fts WHERE reviews_review_fts MATCH %s
+            ORDER BY rank LIMIT %s
+        ) AS found
+        JOIN reviews_review AS review ON review.id = found.rowid
+    )
+    GROUP BY title_id ORDER BY MIN(rank), title_id LIMIT %s
+'''
+
+POSTGRESQL_TITLE_VECTOR = (
+    "to_tsvector('{config}', name || ' ' || description)")
+POSTGRESQL_REVIEW_VECTOR = "to_tsvector('{config}', text)"
+POSTGRESQL_SEARCH = '''
+    SELECT title_id FROM (
+        (SELECT id AS title_id, ts_rank({title_vector}, query) * 10 AS rank
+         FROM reviews_title, plainto_tsquery('{config}', %s) AS query
+         WHERE {title_vector} @@ query
+         ORDER BY rank DESC LIMIT %s)
+        UNION ALL
+        (SELECT title_id, ts_rank({review_vector}, query) AS rank
+         FROM reviews_review, plainto_tsquery('{config}', %s) AS query
+         WHERE {review_vector} @@ query
+         ORDER BY rank DESC LIMIT %s)
+    ) AS found
+    GROUP BY title_id ORDER BY MAX(rank) DESC, title_id LIMIT %s
+'''
+
+
+def get_postgresql_sql(template):
+    config = settings.SEARCH['POSTGRESQL_CONFIG']
+    return template.format(
+        config=config,
+        title_vector=POSTGRESQL_TITLE_VECTOR.format(config=config),
+        review_vector=POSTGRESQL_REVIEW_VECTOR.format(config=config),
+    )
+
+
+def fts5_query(text):
+    """ Слова запроса как префиксы FTS5 в кавычках, связанные через AND. """
+    return ' '.join(f'"{term}"*' for term in TERM.findall(text))
+
+
+def search_title_ids(text, limit=None):
+    """ id подходящих произведений, самые релевантные первыми. """
+    limit = limit or settings.SEARCH['MAX_RESULTS']
+    if not TERM.search(text):
+        return []
+    connection = connections[router.db_for_read(Title)]
+    if connection.vendor == 'sqlite':
+        query = fts5_query(text)
+        params = (query, limit, query, limit, limit)
+        sql = SQLITE_SEARCH
+    elif connection.vendor == 'postgresql':
+        params = (text, limit, text, limit, limit)
+        sql = get_postgresql_sql(POSTGRESQL_SEARCH)
+    else:
+        return list(Title.objects.filter(
+            models.Q(name__icontains=text)
+            | models.Q(description__icontains=text)
+            | models.Q(pk__in=Review.objects.filter(
+                text__icontains=text).values('title_id'))
+        ).values_list('pk', flat=True)[:limit])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
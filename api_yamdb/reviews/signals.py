@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Review, Title
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, raw, **kwargs):
+    """ Запоминает прежнюю оценку, чтобы сдвинуть рейтинг на разницу. """
+    instance._previous_score = None
+    instance._previous_title_id = None
+    if raw or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(
+        'score', 'title_id').first()
+    if previous:
+        instance._previous_score = previous['score']
+        instance._previous_title_id = previous['title_id']
+
+
+@receiver(post_save, sender=Review)
+def add_score_to_rating(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous_score = getattr(instance, '_previous_score', None)
+    if created or previous_score is None:
+        Title.change_rating(instance.title_id, instance.score, 1)
+        return
+    previous_title_id = instance._previous_title_id
+    if previous_title_id != instance.title_id:
+        Title.change_rating(previous_title_id, -previous_score, -1)
+        Title.change_rating(instance.title_id, instance.score, 1)
+    elif previous_score != instance.score:
+        Title.change_rating(
+            instance.title_id, instance.score - previous_score, 0)
+
+
+@receiver(post_delete, sender=Review)
+def remove_score_from_rating(sender, instance, **kwargs):
+    Title.change_rating(instance.title_id, -instance.score, -1)
@@ -2,6 +2,8 @@ import re
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils import timezone
 
 
@@ -10,12 +12,43 @@ def validate_year(year):
         raise ValidationError(f'Год {year} больше текущего!')
 
 
+class UsernameValidator:
+    """ Проверка имени пользователя по RESERVED_USERNAMES и VALID_USERNAME.
+
+    Шаблон компилируется, а список запрещённых имён приводится к frozenset
+    один раз, а не при каждой проверке; при изменении настроек (например,
+    в тестах) проверка перенастраивается.
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        self.reserved = frozenset(
+            name.lower() for name in settings.RESERVED_USERNAMES)
+        self.wrong_symbols = re.compile(settings.VALID_USERNAME)
+
+    def __call__(self, username):
+        if username.lower() in self.reserved:
+            raise ValidationError(
+                f'Имя пользователя не может быть {username}.')
+        wrong_symbols = self.wrong_symbols.findall(username)
+        if wrong_symbols:
+            str_wrong_symbols = ', '.join(
+                dict.fromkeys(''.join(wrong_symbols)))
+            raise ValidationError(
+                f'Обнаружены недопустимые символы: {str_wrong_symbols}!')
+
+
+username_validator = UsernameValidator()
+
+
+@receiver(setting_changed)
+def reconfigure_username_validator(setting, **kwargs):
+    if setting in ('RESERVED_USERNAMES', 'VALID_USERNAME'):
+        username_validator.configure()
+
+
+# Функция остаётся точкой входа: на неё ссылаются поле модели и миграции.
 def validate_username(username):
-    if username.lower() in settings.RESERVED_USERNAMES:
-        raise ValidationError(f'Имя пользователя не может быть {username}.')
-    wrong_symbols = re.findall(settings.VALID_USERNAME, username)
-    if wrong_symbols:
-        set_wrong_symbols = set(''.join(wrong_symbols))
-        str_wrong_symbols = ', '.join(str(x) for x in set_wrong_symbols)
-        raise ValidationError(
-            f'Обнаружены недопустимые символы: {str_wrong_symbols}!')
+    username_validator(username)
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,21 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache, caches
+
+    from api.authentication import user_cache
+    from api.throttling import memory_store
+
+    cache.clear()
+    caches['api_state'].clear()
+    user_cache.clear()
+    memory_store.clear()
+    yield
+    cache.clear()
+    caches['api_state'].clear()
+    user_cache.clear()
+    memory_store.clear()
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при создании отзыва.'
+        )
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'score': 10})
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки в отзыве.'
+        )
+
+        admin_client.delete(f'{url}{reviews[1]["id"]}/')
+        assert self.get_rating(admin_client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=0, rating_count=0, rating=None)
+
+        stale = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert stale.json()['rating'] is None
+
+        call_command('recalculate_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            5, 1, 5
+        ), 'Команда `recalculate_ratings` должна восстанавливать рейтинг.'
+        response = admin_client.get(
+            f'/api/v1/titles/{title_id}/', HTTP_IF_NONE_MATCH=stale['ETag'])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `recalculate_ratings` сбрасывает кэш ответов '
+            'с рейтингом.'
+        )
+        assert response.json()['rating'] == 5
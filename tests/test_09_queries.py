@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    @pytest.mark.parametrize('titles_count', (2, 10))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   titles_count):
+        create_catalogue(titles_count)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data['results']) == titles_count
+        assert all(title['category'] and title['genre']
+                   for title in data['results']), (
+            'Проверьте, что категории и жанры произведений загружаются '
+            'вместе со списком.'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        title = create_catalogue(1)[0]
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_review_create_queries(self, user_client, user,
+                                      django_assert_max_num_queries):
+        title = create_catalogue(1)[0]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        # Пользователь, BEGIN, произведение, вставка и пересчёт рейтинга.
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data={'text': 'Ок', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data={'text': 'Ок', 'score': 7})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение отклоняется '
+            'со статусом 400.'
+        )
+
+    def test_04_comment_on_review_of_other_title(self, user_client, user):
+        from reviews.models import Review
+
+        first, second = create_catalogue(2)
+        review = Review.objects.create(
+            title=first, author=user, text='Отзыв', score=5)
+        response = user_client.get(
+            f'/api/v1/titles/{second.id}/reviews/{review.id}/comments/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии доступны только для отзыва, '
+            'относящегося к произведению из адреса.'
+        )
+
+    @pytest.mark.parametrize('titles_count', (3, 30))
+    def test_05_titles_batch_by_ids(self, client, django_assert_num_queries,
+                                    titles_count):
+        titles = create_catalogue(titles_count)
+        ids = [title.id for title in reversed(titles)]
+        with django_assert_num_queries(3):
+            response = client.get(
+                '/api/v1/titles/', {'ids': ','.join(map(str, ids))})
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()['results']] == ids, (
+            'Проверьте, что `?ids=` возвращает все запрошенные произведения '
+            'в порядке запроса.'
+        )
+        assert 'rating' in response.json()['results'][0]
+
+    def test_06_titles_batch_limit(self, client, settings):
+        settings.LIMIT_BATCH_IDS = 2
+        response = client.get('/api/v1/titles/', {'ids': '1,2,3'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_07_title_genres_in_one_query(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Genre
+
+        create_catalogue(0)
+        Genre.objects.bulk_create(
+            Genre(name=f'Ещё жанр {idx}', slug=f'more-{idx}')
+            for idx in range(8))
+        slugs = [f'more-{idx}' for idx in range(8)]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': 'Восемь жанров', 'year': 2000,
+                'category': 'cat-0', 'genre': slugs})
+        assert response.status_code == HTTPStatus.CREATED
+        # Кроме поиска slug'ов жанры читает только m2m set() и ответ.
+        genre_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_genre" WHERE' in query['sql']]
+        assert len(genre_queries) == 1, (
+            'Проверьте, что все жанры произведения ищутся одним запросом.'
+        )
+
+        title_id = response.json()['id']
+        response = admin_client.patch(
+            f'/api/v1/titles/{title_id}/',
+            data={'genre': ['more-0', 'missing-1', 'missing-2']},
+            format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert len(response.json()['genre']) == 2, (
+            'Проверьте, что обо всех ненайденных жанрах сообщается сразу.'
+        )
+
+    def test_08_titles_batch_without_cursor(self, client):
+        titles = create_catalogue(2)
+        response = client.get('/api/v1/titles/', {
+            'ids': f'{titles[1].id},{titles[0].id}', 'cursor': ''})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `?ids=` нельзя совместить с `cursor`: курсор '
+            'не сохраняет порядок запрошенных id.'
+        )
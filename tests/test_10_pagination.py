@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def collect_pages(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсорной пагинации не выполняется '
+                'подсчёт всех объектов.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_titles_cursor_pages(self, client):
+        titles = create_catalogue(7)
+        results = self.collect_pages(client, '/api/v1/titles/?cursor=&limit=3')
+        assert [title['id'] for title in results] == [
+            title.id for title in sorted(titles, key=lambda t: t.name)
+        ], 'Курсорная пагинация должна вернуть все произведения по порядку.'
+
+    def test_02_reviews_cursor_pages(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        results = self.collect_pages(client, f'{url}?cursor=&limit=2')
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reversed(reviews)
+        ], 'Курсорная пагинация отзывов должна идти от новых к старым.'
+
+        response = client.get(f'{url}?limit=2&offset=2')
+        assert response.json()['count'] == len(reviews), (
+            'Пагинация limit/offset должна остаться доступной.'
+        )
+
+
+def count_queries(client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    counts = [query['sql'] for query in context.captured_queries
+              if 'COUNT(' in query['sql']]
+    return response.json()['count'], len(counts)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CachedCount:
+
+    def test_01_count_is_cached_between_pages(self, client, admin_client):
+        titles = create_catalogue(5)
+        assert count_queries(client, '/api/v1/titles/?limit=2') == (5, 1)
+        assert count_queries(
+            client, '/api/v1/titles/?limit=2&offset=2') == (5, 0), (
+            'Проверьте, что число произведений не пересчитывается '
+            'для каждой страницы списка.'
+        )
+        assert count_queries(
+            client, '/api/v1/titles/?limit=2&category=cat-0') == (2, 1), (
+            'Проверьте, что число объектов кэшируется отдельно для '
+            'каждого набора фильтров.'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{titles[0].id}/')
+        assert count_queries(
+            client, '/api/v1/titles/?limit=2&offset=4') == (4, 1), (
+            'Проверьте, что после записи число объектов считается заново.'
+        )
+
+    def test_02_estimated_count(self, client, settings, monkeypatch):
+        from api import pagination
+
+        create_catalogue(3)
+        settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False,
+                              'COUNT_ESTIMATE_THRESHOLD': 1000}
+        monkeypatch.setattr(pagination, 'estimate_count', lambda qs: 100)
+        assert count_queries(client, '/api/v1/titles/') == (3, 1), (
+            'Ниже порога должен выполняться точный подсчёт.'
+        )
+        monkeypatch.setattr(pagination, 'estimate_count', lambda qs: 5000)
+        assert count_queries(client, '/api/v1/titles/') == (5000, 0), (
+            'Выше порога должна отдаваться оценка числа объектов.'
+        )
+
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_genres_cached_until_write(self, client, admin_client,
+                                          django_assert_num_queries):
+        url = '/api/v1/genres/'
+        admin_client.post(url, data={'name': 'Ужасы', 'slug': 'horror'})
+        first = client.get(url).json()
+        with django_assert_num_queries(0):
+            second = client.get(url).json()
+        assert first == second, (
+            'Проверьте, что повторный GET-запрос к `/api/v1/genres/` '
+            'отдаётся из кэша.'
+        )
+
+        admin_client.post(url, data={'name': 'Драма', 'slug': 'drama'})
+        assert client.get(url).json()['count'] == 2, (
+            'Проверьте, что создание жанра сбрасывает кэш списка жанров.'
+        )
+        admin_client.delete(f'{url}horror/')
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что удаление жанра сбрасывает кэш списка жанров.'
+        )
+
+    def test_02_title_cache_follows_reviews(self, client, user_client, user):
+        title = create_catalogue(1)[0]
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] is None
+        create_single_review(user_client, title.id, 'Отлично', 9)
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        url = '/api/v1/genres/'
+        client.get(url)
+        client.get(url)
+        assert user_client.get('/api/v1/cache/stats/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (data['hits'], data['misses']) == (1, 1)
+
+    def test_04_reviews_cache_follows_author_names(self, client, user_client,
+                                                   user):
+        title = create_catalogue(1)[0]
+        create_single_review(user_client, title.id, 'Отлично', 9)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'})
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+            HTTPStatus.NOT_MODIFIED
+        ), 'Проверьте, что регистрация не сбрасывает кэш отзывов.'
+
+        user.username = 'renamed'
+        user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени автора сбрасывает кэш отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
@@ -0,0 +1,41 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsv:
+
+    def test_01_load_all_files(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('load_csv', batch_size=10)
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Comment.objects.exists()
+        title = Title.objects.get(pk=1)
+        scores = list(Review.objects.filter(title=title).values_list(
+            'score', flat=True))
+        assert title.rating == sum(scores) // len(scores), (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг.'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла.'
+        )
+
+        call_command('load_csv', 'titles.csv')
+        assert Title.objects.count() == 32, (
+            'Повторная загрузка не должна дублировать строки.'
+        )
+
+    def test_02_load_changes_etag(self, client):
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 0
+        call_command('load_csv', 'category.csv', 'genre.csv', 'titles.csv')
+        response = client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после `load_csv` меняются версии кэша API.'
+        )
+        assert response.json()['count'] == 32
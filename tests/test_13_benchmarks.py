@@ -0,0 +1,549 @@
+"""Бенчмарк эндпоинтов API: число запросов к БД, время ответа и размер.
+
+Запуск: `pytest -m benchmark`. Размер данных и число повторов задаются
+переменными окружения BENCHMARK_TITLES, BENCHMARK_REVIEWS,
+BENCHMARK_COMMENTS и BENCHMARK_REPEAT. Отчёт пишется в JSON по пути из
+BENCHMARK_REPORT; если задан BENCHMARK_BASELINE (отчёт с прошлого коммита),
+тест падает, когда эндпоинт стал делать больше запросов к БД.
+
+Второй тест сравнивает пропускную способность чтения через wsgi.py и
+asgi.py при BENCHMARK_CONCURRENCY одновременных клиентах; результат
+пишется в BENCHMARK_ASGI_REPORT.
+
+Третий тест сравнивает JSONRenderer DRF и FastJSONRenderer на выводе
+ReadOnlyTitleSerializer и ReviewSerializer; отчёт в BENCHMARK_JSON_REPORT.
+Четвёртый сравнивает эти сериализаторы со списками из `.values()` на
+страницах по 100 объектов; отчёт в BENCHMARK_LIST_REPORT.
+Пятый измеряет число проверок имён пользователей в секунду для импорта
+BENCHMARK_USERNAMES пользователей и потока регистраций; отчёт
+в BENCHMARK_USERNAME_REPORT.
+Шестой измеряет полнотекстовый поиск на BENCHMARK_SEARCH_REVIEWS отзывах
+(по умолчанию миллион строк) и падает, если медиана запроса к индексу
+по избирательным словам больше BENCHMARK_SEARCH_TARGET_MS. Слова из
+каждого отзыва только попадают в отчёт BENCHMARK_SEARCH_REPORT: bm25
+читает весь список документов слова, и время растёт с числом совпадений.
+"""
+import asyncio
+import io
+import json
+import os
+import re
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver
+
+from tests.test_21_asgi import asgi_request
+
+pytestmark = pytest.mark.benchmark
+
+TITLES = int(os.getenv('BENCHMARK_TITLES', 100))
+REVIEWS = int(os.getenv('BENCHMARK_REVIEWS', 1000))
+COMMENTS = int(os.getenv('BENCHMARK_COMMENTS', 1000))
+REPEAT = int(os.getenv('BENCHMARK_REPEAT', 20))
+REPORT = os.getenv('BENCHMARK_REPORT', 'benchmark_report.json')
+BASELINE = os.getenv('BENCHMARK_BASELINE')
+CONCURRENCY = int(os.getenv('BENCHMARK_CONCURRENCY', 16))
+ASGI_REPORT = os.getenv(
+    'BENCHMARK_ASGI_REPORT', 'benchmark_asgi_report.json')
+JSON_REPORT = os.getenv(
+    'BENCHMARK_JSON_REPORT', 'benchmark_json_report.json')
+LIST_REPORT = os.getenv(
+    'BENCHMARK_LIST_REPORT', 'benchmark_list_report.json')
+PAGE_SIZE = 100
+USERNAMES = int(os.getenv('BENCHMARK_USERNAMES', 100000))
+USERNAME_REPORT = os.getenv(
+    'BENCHMARK_USERNAME_REPORT', 'benchmark_username_report.json')
+SEARCH_TITLES = int(os.getenv('BENCHMARK_SEARCH_TITLES', 10000))
+SEARCH_REVIEWS = int(os.getenv('BENCHMARK_SEARCH_REVIEWS', 1000000))
+SEARCH_TARGET_MS = float(os.getenv('BENCHMARK_SEARCH_TARGET_MS', 10))
+SEARCH_REPORT = os.getenv(
+    'BENCHMARK_SEARCH_REPORT', 'benchmark_search_report.json')
+# Запрос и нужно ли ему укладываться в BENCHMARK_SEARCH_TARGET_MS:
+# «редкое» есть в каждом 997-м отзыве, «отзыва» — во всех.
+SEARCH_QUERIES = {
+    'редкое': True,
+    'Произведение 4242': True,
+    'редкое слово': True,
+    'Произведение': False,
+    'отзыва': False,
+}
+BATCH_SIZE = 1000
+GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+QUERY_PARAMS = {
+    '/api/v1/titles/search/': {'q': 'Произведение'},
+}
+
+
+def seed(admin):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    # SQLite не возвращает id из bulk_create, поэтому объекты
+    # перечитываются из базы после вставки.
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(5))
+    categories = list(Category.objects.order_by('pk'))
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(10))
+    genres = list(Genre.objects.order_by('pk'))
+    Title.objects.bulk_create(
+        (Title(name=f'Произведение {idx}', year=1900 + idx % 120,
+               description='Описание ' * 10,
+               category=categories[idx % len(categories)])
+         for idx in range(TITLES)), batch_size=BATCH_SIZE)
+    titles = list(Title.objects.order_by('pk'))
+    Title.genre.through.objects.bulk_create(
+        (Title.genre.through(title=title, genre=genres[(idx + shift) % 10])
+         for idx, title in enumerate(titles) for shift in range(2)),
+        batch_size=BATCH_SIZE)
+    authors_count = max(-(-REVIEWS // TITLES), 1)
+    get_user_model().objects.bulk_create(
+        (get_user_model()(username=f'author{idx}',
+                          email=f'author{idx}@yamdb.fake')
+         for idx in range(authors_count)), batch_size=BATCH_SIZE)
+    authors = list(get_user_model().objects.filter(
+        username__startswith='author').order_by('pk'))
+    Review.objects.bulk_create(
+        (Review(title=titles[idx % TITLES],
+                author=authors[idx // TITLES],
+                text='Текст отзыва ' * 20, score=idx % 10 + 1)
+         for idx in range(REVIEWS)), batch_size=BATCH_SIZE)
+    Title.recalculate_ratings()
+    reviews = list(Review.objects.order_by('pk').only('pk', 'title_id'))
+    Comment.objects.bulk_create(
+        (Comment(review=reviews[idx % len(reviews)],
+                 author=authors[idx % len(authors)],
+                 text='Текст комментария ' * 5)
+         for idx in range(COMMENTS)), batch_size=BATCH_SIZE)
+    review = reviews[0]
+    return {
+        'pk': {
+            'titles': review.title_id,
+            'reviews': review.pk,
+            'comments': review.comments.order_by('pk').first().pk,
+        },
+        'title_id': review.title_id,
+        'review_id': review.pk,
+        'username': admin.username,
+    }
+
+
+def iter_routes(patterns, prefix=''):
+    """ Обходит urls.py и отдаёт (шаблон адреса, имя, view) без суффиксов. """
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern).lstrip('^').rstrip('$')
+        if '(?P<format>' in route:
+            continue
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        else:
+            yield route, pattern.name, pattern.callback
+
+
+def get_methods(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is None:
+        view_class = getattr(callback, 'cls', None)
+        actions = [method for method in ('get', 'post')
+                   if hasattr(view_class, method)]
+    return [method for method in ('get', 'post') if method in actions]
+
+
+def build_url(route, name, ids):
+    basename = (name or '').split('-')[0]
+
+    def value(match):
+        key = match.group(1)
+        if key == 'pk':
+            return str(ids['pk'][basename])
+        return str(ids[key])
+
+    return '/api/' + GROUP.sub(value, route)
+
+
+def get_payloads(user):
+    from django.contrib.auth.tokens import default_token_generator
+
+    counter = iter(range(10 ** 9))
+    code = default_token_generator.make_token(user)
+    return {
+        '/api/v1/auth/signup/': lambda: {
+            'username': f'signup{next(counter)}',
+            'email': f'signup{next(counter)}@yamdb.fake'},
+        '/api/v1/auth/token/': lambda: {
+            'username': user.username, 'confirmation_code': code},
+    }
+
+
+def measure(client, method, url, payload):
+    timings = []
+    for _ in range(REPEAT):
+        data = payload() if payload else QUERY_PARAMS.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data=data)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code < 400, (
+            f'{method.upper()} {url}: {response.status_code}')
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'status': response.status_code,
+        'queries': len(queries),
+        'bytes': len(response.content),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+    }
+
+
+@pytest.mark.django_db
+def test_endpoints_benchmark(admin, admin_client, settings):
+    from api.urls import urlpatterns
+
+    if os.getenv('BENCHMARK_CACHE') != 'True':
+        settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    # Бенчмарк шлёт регистрации подряд с одного адреса.
+    settings.AUTH_THROTTLE = {**settings.AUTH_THROTTLE, 'ENABLED': False}
+    ids = seed(admin)
+    payloads = get_payloads(admin)
+    results = {}
+    for route, name, callback in iter_routes(urlpatterns):
+        methods = get_methods(callback)
+        if not methods:
+            continue
+        url = build_url(route, name, ids)
+        for method in methods:
+            if method == 'post' and url not in payloads:
+                continue
+            results[f'{method.upper()} {url}'] = measure(
+                admin_client, method, url, payloads.get(url))
+
+    report = {
+        'dataset': {'titles': TITLES, 'reviews': REVIEWS,
+                    'comments': COMMENTS, 'repeat': REPEAT},
+        'endpoints': results,
+    }
+    with open(REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=2)
+
+    if BASELINE:
+        with open(BASELINE, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['endpoints']
+        regressions = {
+            endpoint: (baseline[endpoint]['queries'], result['queries'])
+            for endpoint, result in results.items()
+            if endpoint in baseline
+            and result['queries'] > baseline[endpoint]['queries']
+        }
+        assert not regressions, (
+            f'Выросло число запросов к БД (было, стало): {regressions}')
+
+
+def wsgi_get(application, path):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'testserver',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+    }
+    statuses = []
+    body = b''.join(application(
+        environ, lambda status, headers: statuses.append(status)))
+    assert statuses[0].startswith('200'), f'GET {path}: {statuses[0]}'
+    return body
+
+
+def wsgi_throughput(paths):
+    from api_yamdb.wsgi import application
+
+    def client(_):
+        for path in paths:
+            wsgi_get(application, path)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        list(pool.map(client, range(CONCURRENCY)))
+    return len(paths) * CONCURRENCY / (time.perf_counter() - started)
+
+
+def asgi_throughput(application, paths):
+    async def client():
+        for path in paths:
+            status, _ = await asgi_request(application, 'GET', path)
+            assert status == 200, f'GET {path}: {status}'
+
+    async def run():
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+        return len(paths) * CONCURRENCY / (time.perf_counter() - started)
+
+    return async_to_sync(run)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_wsgi_throughput(admin, settings):
+    from django.core.handlers.asgi import ASGIHandler
+
+    from api_yamdb.asgi import application
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    ids = seed(admin)
+    title_id = ids['title_id']
+    paths = [
+        '/api/v1/titles/', f'/api/v1/titles/{title_id}/',
+        '/api/v1/genres/', f'/api/v1/titles/{title_id}/reviews/',
+        f'/api/v1/titles/{title_id}/reviews/{ids["review_id"]}/comments/',
+    ] * max(REPEAT // 5, 1)
+    results = {
+        'wsgi_rps': wsgi_throughput(paths),
+        'asgi_sync_views_rps': asgi_throughput(ASGIHandler(), paths),
+        'asgi_async_reads_rps': asgi_throughput(application, paths),
+    }
+    report = {
+        'concurrency': CONCURRENCY,
+        'requests': len(paths) * CONCURRENCY,
+        **{key: round(value, 1) for key, value in results.items()},
+    }
+    with open(ASGI_REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def time_calls(function, *args):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        function(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+@pytest.mark.django_db
+def test_json_rendering_benchmark(admin):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import ReadOnlyTitleSerializer, ReviewSerializer
+    from reviews.models import Review, Title
+
+    assert orjson is not None, 'Для бенчмарка нужен установленный orjson.'
+    seed(admin)
+    payloads = {
+        'titles': ReadOnlyTitleSerializer(
+            Title.objects.select_related('category').prefetch_related(
+                'genre'), many=True).data,
+        'reviews': ReviewSerializer(
+            Review.objects.select_related('author'), many=True).data,
+    }
+    results = {}
+    for name, data in payloads.items():
+        content = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == content
+        result = {
+            'bytes': len(content),
+            'render_drf_ms': time_calls(JSONRenderer().render, data),
+            'render_fast_ms': time_calls(FastJSONRenderer().render, data),
+            'parse_drf_ms': time_calls(
+                lambda: JSONParser().parse(io.BytesIO(content))),
+            'parse_fast_ms': time_calls(
+                lambda: FastJSONParser().parse(io.BytesIO(content))),
+        }
+        result['render_speedup'] = (
+            result['render_drf_ms'] / result['render_fast_ms'])
+        result['parse_speedup'] = (
+            result['parse_drf_ms'] / result['parse_fast_ms'])
+        results[name] = {key: round(value, 3)
+                         for key, value in result.items()}
+    with open(JSON_REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump(results, report_file, indent=2)
+    for name, result in results.items():
+        assert result['render_speedup'] > 1, (
+            f'{name}: FastJSONRenderer медленнее JSONRenderer: {result}')
+
+
+@pytest.mark.django_db
+def test_list_serializers_benchmark(admin):
+    from api.serializers import (CommentListSerializer, CommentSerializer,
+                                 ReadOnlyTitleSerializer,
+                                 ReviewListSerializer, ReviewSerializer,
+                                 TitleListSerializer)
+    from reviews.models import Comment, Review, Title
+
+    seed(admin)
+    cases = {
+        'titles': (
+            Title.objects.select_related('category').prefetch_related(
+                'genre'), ReadOnlyTitleSerializer, TitleListSerializer),
+        'reviews': (Review.objects.all(), ReviewSerializer,
+                    ReviewListSerializer),
+        'comments': (Comment.objects.all(), CommentSerializer,
+                     CommentListSerializer),
+    }
+    results = {}
+    for name, (queryset, serializer, list_serializer) in cases.items():
+        def model_page():
+            return serializer(queryset[:PAGE_SIZE], many=True).data
+
+        def values_page():
+            return list_serializer(
+                list_serializer.get_values(queryset)[:PAGE_SIZE]).data
+
+        assert values_page() == model_page()
+        with CaptureQueriesContext(connection) as model_queries:
+            model_page()
+        with CaptureQueriesContext(connection) as values_queries:
+            values_page()
+        result = {
+            'model_ms': time_calls(model_page),
+            'values_ms': time_calls(values_page),
+            'model_queries': len(model_queries),
+            'values_queries': len(values_queries),
+        }
+        result['speedup'] = result['model_ms'] / result['values_ms']
+        results[name] = {key: round(value, 3)
+                         for key, value in result.items()}
+    with open(LIST_REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump({'page_size': PAGE_SIZE, 'lists': results},
+                  report_file, indent=2)
+    for name, result in results.items():
+        assert result['speedup'] > 1, (
+            f'{name}: список из .values() медленнее сериализатора: {result}')
+
+
+def validate_username_per_call(username):
+    """ Прежняя проверка: шаблон и список имён читаются из настроек. """
+    from django.conf import settings
+    from django.core.exceptions import ValidationError
+
+    if username.lower() in settings.RESERVED_USERNAMES:
+        raise ValidationError(f'Имя пользователя не может быть {username}.')
+    wrong_symbols = re.findall(settings.VALID_USERNAME, username)
+    if wrong_symbols:
+        raise ValidationError(
+            f'Обнаружены недопустимые символы: {wrong_symbols}!')
+
+
+def validations_per_second(validator, usernames):
+    started = time.perf_counter()
+    for username in usernames:
+        try:
+            validator(username)
+        except Exception:
+            pass
+    return len(usernames) / (time.perf_counter() - started)
+
+
+def test_username_validation_benchmark():
+    from api.serializers import SignUpSerializer
+    from reviews.validators import validate_username
+
+    # Каждое сотое имя с недопустимыми символами, как в реальном импорте.
+    usernames = [f'user.{idx}' if idx % 100 else f'user {idx}!'
+                 for idx in range(USERNAMES)]
+    results = {
+        'import_per_call_rps': validations_per_second(
+            validate_username_per_call, usernames),
+        'import_rps': validations_per_second(validate_username, usernames),
+    }
+    signups = [{'username': username, 'email': f'{idx}@yamdb.fake'}
+               for idx, username in enumerate(usernames[:USERNAMES // 100])]
+    results['signup_rps'] = validations_per_second(
+        lambda data: SignUpSerializer(data=data).is_valid(), signups)
+    results['import_speedup'] = (
+        results['import_rps'] / results['import_per_call_rps'])
+    with open(USERNAME_REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump({'usernames': USERNAMES,
+                   **{key: round(value, 1)
+                      for key, value in results.items()}},
+                  report_file, indent=2)
+    assert results['import_speedup'] > 1, (
+        f'Проверка имён не стала быстрее: {results}')
+
+
+def seed_search():
+    from django.contrib.auth import get_user_model
+    from reviews.models import Category, Review, Title
+
+    category = Category.objects.create(name='Категория', slug='category')
+    Title.objects.bulk_create(
+        (Title(name=f'Произведение {idx}', year=1900 + idx % 120,
+               description=f'Описание произведения номер {idx}',
+               category=category)
+         for idx in range(SEARCH_TITLES)), batch_size=BATCH_SIZE)
+    title_ids = list(Title.objects.order_by('pk').values_list(
+        'pk', flat=True))
+    authors_count = max(-(-SEARCH_REVIEWS // SEARCH_TITLES), 1)
+    get_user_model().objects.bulk_create(
+        (get_user_model()(username=f'searcher{idx}',
+                          email=f'searcher{idx}@yamdb.fake')
+         for idx in range(authors_count)), batch_size=BATCH_SIZE)
+    author_ids = list(get_user_model().objects.filter(
+        username__startswith='searcher').order_by('pk').values_list(
+        'pk', flat=True))
+    for start in range(0, SEARCH_REVIEWS, BATCH_SIZE):
+        Review.objects.bulk_create(
+            Review(title_id=title_ids[idx % SEARCH_TITLES],
+                   author_id=author_ids[idx // SEARCH_TITLES],
+                   text=(f'Текст отзыва {idx} '
+                         + ('редкое слово ' if idx % 997 == 0 else '')),
+                   score=idx % 10 + 1)
+            for idx in range(start, min(start + BATCH_SIZE, SEARCH_REVIEWS)))
+
+
+def percentiles_ms(timings):
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+    }
+
+
+@pytest.mark.django_db
+def test_search_benchmark(admin_client, settings):
+    from reviews.search import search_title_ids
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    seed_search()
+    results = {}
+    for query, checked in SEARCH_QUERIES.items():
+        query_timings, route_timings = [], []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            found = search_title_ids(query)
+            query_timings.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            response = admin_client.get(
+                '/api/v1/titles/search/', {'q': query})
+            route_timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, (
+            f'Поиск «{query}»: {response.status_code}')
+        results[query] = {
+            'found': len(found),
+            'checked': checked,
+            'query': percentiles_ms(query_timings),
+            'route': percentiles_ms(route_timings),
+        }
+    with open(SEARCH_REPORT, 'w', encoding='utf-8') as report_file:
+        json.dump({'titles': SEARCH_TITLES, 'reviews': SEARCH_REVIEWS,
+                   'target_ms': SEARCH_TARGET_MS, 'queries': results},
+                  report_file, ensure_ascii=False, indent=2)
+    slow = {query: result['query']['p50_ms']
+            for query, result in results.items()
+            if result['checked']
+            and result['query']['p50_ms'] > SEARCH_TARGET_MS}
+    assert not slow, (
+        f'Поиск медленнее {SEARCH_TARGET_MS} мс (медиана): {slow}')
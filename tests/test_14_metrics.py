@@ -0,0 +1,58 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue
+
+METRICS_MIDDLEWARE = 'api.metrics.RequestMetricsMiddleware'
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    from api.metrics import reset_metrics
+
+    settings.MIDDLEWARE = [METRICS_MIDDLEWARE, *settings.MIDDLEWARE]
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14RequestMetrics:
+
+    def test_01_server_timing_header(self, client, metrics_enabled):
+        create_catalogue(3)
+        response = client.get('/api/v1/titles/')
+        timing = response.get('Server-Timing', '')
+        assert 'db;desc="3 queries"' in timing, (
+            'Проверьте, что заголовок `Server-Timing` содержит число '
+            'запросов к БД.'
+        )
+        assert 'render;dur=' in timing and 'total;dur=' in timing
+        serialize = re.search(r'serialize;dur=([\d.]+)', timing)
+        assert serialize and float(serialize.group(1)) > 0, (
+            'Проверьте, что заголовок `Server-Timing` содержит время '
+            'сериализации ответа.'
+        )
+
+    def test_02_metrics_endpoint(self, client, admin_client, user_client,
+                                 metrics_enabled):
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/?search=a')
+        assert user_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == HTTPStatus.OK
+        routes = [route for route in response.json()
+                  if route.startswith('GET') and 'genres' in route]
+        assert len(routes) == 1
+        stats = response.json()[routes[0]]
+        assert stats['count'] == 2
+        assert stats['avg_serialize_ms'] > 0
+        assert sum(stats['histogram_ms'].values()) == 2
+
+    def test_03_disabled_by_default(self, client):
+        response = client.get('/api/v1/genres/')
+        assert 'Server-Timing' not in response
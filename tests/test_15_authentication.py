@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15CachedAuthentication:
+
+    def get_client(self, user):
+        from django.contrib.auth.tokens import default_token_generator
+
+        response = APIClient().post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+        return client, response.json()['token']
+
+    def test_01_token_has_role_claims(self, admin):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        _, token = self.get_client(admin)
+        token = AccessToken(token)
+        assert (token['role'], token['is_staff'], token['is_superuser']) == (
+            'admin', False, False
+        ), 'Проверьте, что токен содержит роль и флаги пользователя.'
+
+    def test_02_user_is_not_loaded_twice(self, admin,
+                                         django_assert_num_queries):
+        client, _ = self.get_client(admin)
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/users/me/')
+        assert response.json()['username'] == admin.username
+
+    def test_03_role_change_reloads_user(self, admin, user):
+        client, _ = self.get_client(admin)
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'После смены роли права пользователя должны обновиться.'
+
+    def test_04_profile_update_is_visible(self, user):
+        client, _ = self.get_client(user)
+        client.get('/api/v1/users/me/')
+        client.patch('/api/v1/users/me/', data={'bio': 'Новое о себе'})
+        assert client.get('/api/v1/users/me/').json()['bio'] == (
+            'Новое о себе'
+        )
+
+    def test_05_profile_update_keeps_stored_fields(self, user):
+        from reviews.models import User
+
+        client, _ = self.get_client(user)
+        client.get('/api/v1/users/me/')
+        # Другой процесс сменил роль: кэш аутентификации об этом не знает.
+        User.objects.filter(pk=user.pk).update(role='moderator')
+        response = client.patch('/api/v1/users/me/', data={'bio': 'О себе'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.role, user.bio) == ('moderator', 'О себе'), (
+            'Проверьте, что PATCH `/api/v1/users/me/` не перезаписывает '
+            'поля пользователя устаревшими значениями из кэша.'
+        )
@@ -0,0 +1,69 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.fixture
+def outbox_enabled(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'ENABLED': True}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client, outbox_enabled):
+        from reviews.models import OutgoingEmail
+
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'С включённой очередью письмо не должно отправляться '
+            'во время запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to == data['email']
+
+        call_command('send_emails', once=True, workers=1)
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [data['email']]
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (OutgoingEmail.SENT, 1)
+
+    def test_02_file_backend(self, client, outbox_enabled, settings,
+                             tmp_path):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend')
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        for idx in range(3):
+            client.post(self.url_signup, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'})
+
+        call_command('send_emails', once=True, workers=1)
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1, (
+            'Пачка писем должна уходить через одно соединение.'
+        )
+        assert files[0].read_text().count('Subject:') == 3
+
+    def test_03_failed_delivery_is_retried(self, client, outbox_enabled,
+                                           monkeypatch):
+        from reviews import outbox
+        from reviews.models import OutgoingEmail
+
+        client.post(self.url_signup, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'})
+
+        class BrokenConnection:
+            def open(self):
+                raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(outbox, 'get_connection', BrokenConnection)
+        call_command('send_emails', once=True, workers=1)
+        email = OutgoingEmail.objects.get()
+        assert (email.status, email.attempts) == (OutgoingEmail.PENDING, 1)
+        assert 'SMTP' in email.last_error
+        assert outbox.claim_batch(10) == [], (
+            'Повторная попытка должна быть отложена.'
+        )
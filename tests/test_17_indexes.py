@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN для SQLite')
+
+
+def assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, (
+        f'Запрос должен использовать индекс `{index_name}`:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Запрос не должен сортировать во временном B-дереве:\n{plan}'
+    )
+
+
+@pytest.mark.django_db
+class Test17Indexes:
+
+    def test_01_reviews_of_title(self):
+        from reviews.models import Review
+
+        assert_uses_index(
+            Review.objects.filter(title_id=1)[:10], 'review_title_pub_date')
+
+    def test_02_comments_of_review(self):
+        from reviews.models import Comment
+
+        assert_uses_index(
+            Comment.objects.filter(review_id=1)[:10],
+            'comment_review_pub_date')
+
+    def test_03_titles_of_category(self):
+        from reviews.models import Title
+
+        assert_uses_index(
+            Title.objects.filter(category_id=1)[:10], 'title_category_name')
+
+    def test_04_titles_by_name(self):
+        from reviews.models import Title
+
+        assert_uses_index(
+            Title.objects.order_by('name', 'id')[:10], 'title_name')
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review
+
+URL = '/api/v1/titles/search/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Search:
+
+    def create_titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        return [
+            Title.objects.create(
+                name=name, description=description, year=2000,
+                category=category)
+            for name, description in (
+                ('Побег из Шоушенка', 'Тюремная драма о надежде'),
+                ('Крестный отец', 'Семейная сага о мафии'),
+                ('Зелёная миля', 'Надзиратели и заключённые в тюрьме'),
+            )
+        ]
+
+    def search(self, client, query):
+        response = client.get(URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client):
+        escape, godfather, mile = self.create_titles()
+        assert self.search(client, 'крестный') == [godfather.id]
+        assert self.search(client, 'тюр') == [escape.id, mile.id], (
+            'Поиск должен находить слова из описания, в том числе по '
+            'началу слова.'
+        )
+        assert self.search(client, 'мафия надежда') == []
+
+    def test_02_search_follows_writes(self, client, user_client):
+        escape, godfather, _ = self.create_titles()
+        create_single_review(user_client, godfather.id, 'Лучшее кино', 10)
+        assert self.search(client, 'кино') == [godfather.id], (
+            'Поиск должен находить произведения по тексту отзывов.'
+        )
+
+        escape.name = 'Искупление'
+        escape.save()
+        assert self.search(client, 'искупление') == [escape.id]
+        assert self.search(client, 'шоушенка') == []
+        godfather.delete()
+        assert self.search(client, 'кино') == []
+
+    def test_03_name_ranks_above_reviews(self, client, user_client):
+        escape, godfather, _ = self.create_titles()
+        create_single_review(user_client, escape.id, 'Лучше, чем Крестный '
+                             'отец', 9)
+        assert self.search(client, 'крестный') == [godfather.id, escape.id]
+
+    def test_04_empty_query(self, client):
+        assert client.get(URL).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_fts_triggers_exist(self):
+        from django.db import connection
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('Триггеры FTS5 создаются только для SQLite.')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'reviews\\_%\\_fts\\_%' ESCAPE '\\'")
+            triggers = {name for name, in cursor.fetchall()}
+        assert triggers == {
+            f'reviews_{table}_fts_{event}'
+            for table in ('title', 'review')
+            for event in ('insert', 'update', 'delete')
+        }, (
+            'Проверьте, что миграция `0005_search` создаёт триггеры '
+            'обновления поискового индекса.'
+        )
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='Только SQLite')
+def test_sqlite_pragmas():
+    from django.db import connections
+
+    connections['default'].close()
+    new_connection = connections['default']
+    new_connection.ensure_connection()
+    with new_connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        assert cursor.fetchone()[0] == 1, (
+            'Проверьте, что для SQLite включён `synchronous = NORMAL`.'
+        )
+
+
+def test_unusable_connection_is_closed(monkeypatch):
+    from django.db import connections
+
+    from reviews.db import check_persistent_connections
+
+    default = connections['default']
+    monkeypatch.setitem(default.settings_dict, 'CONN_HEALTH_CHECKS', True)
+    monkeypatch.setattr(default, 'connection', object())
+    monkeypatch.setattr(default, 'is_usable', lambda: False)
+    closed = []
+    monkeypatch.setattr(default, 'close', lambda: closed.append(True))
+
+    check_persistent_connections(sender=None)
+    assert closed, (
+        'Проверьте, что перед запросом закрываются разорванные соединения.'
+    )
@@ -0,0 +1,92 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ConditionalGet:
+
+    def test_01_etag_not_modified(self, client, django_assert_num_queries):
+        create_catalogue(3)
+        url = '/api/v1/titles/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag.startswith('"') and response.get('Last-Modified'), (
+            'Проверьте, что ответ содержит заголовки `ETag` и '
+            '`Last-Modified`.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+        other = client.get(f'{url}?limit=1')
+        assert other['ETag'] != etag, (
+            'ETag должен зависеть от параметров запроса.'
+        )
+
+    def test_02_if_modified_since(self, client):
+        create_catalogue(1)
+        response = client.get('/api/v1/genres/')
+        response = client.get(
+            '/api/v1/genres/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_03_review_write_changes_etag(self, client, user_client, user):
+        title = create_catalogue(1)[0]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+        title_etag = client.get(f'/api/v1/titles/{title.id}/')['ETag']
+        create_single_review(user_client, title.id, 'Хорошо', 8)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'После нового отзыва список отзывов должен отдаваться заново.'
+        )
+        assert len(response.json()['results']) == 1
+        response = client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['rating'] == 8
+
+    def test_04_missing_object_is_not_found(self, client):
+        from django.utils.http import http_date
+
+        title = create_catalogue(1)[0]
+        future = http_date(time.time() + 3600)
+        for url in (f'/api/v1/titles/{title.id + 1}/',
+                    f'/api/v1/titles/{title.id + 1}/reviews/'):
+            for headers in ({'HTTP_IF_NONE_MATCH': '*'},
+                            {'HTTP_IF_MODIFIED_SINCE': future}):
+                response = client.get(url, **headers)
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что `{url}` с условными заголовками '
+                    'возвращает 404 для несуществующего объекта, а не 304.'
+                )
+        response = client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_05_versions_are_shared(self, client, settings):
+        from django.core.cache.backends.filebased import FileBasedCache
+        from reviews.models import Title
+
+        from api.cache import make_key
+
+        create_catalogue(1)
+        etag = client.get('/api/v1/titles/')['ETag']
+        # Другой процесс открывает то же хранилище версий и пишет в него.
+        state = FileBasedCache(
+            settings.CACHES[settings.API_CACHE['STATE_ALIAS']]['LOCATION'],
+            {})
+        state.incr(make_key('version', Title._meta.label_lower))
+        response = client.get('/api/v1/titles/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что версии данных хранятся в общем для процессов '
+            'кэше и запись в другом процессе меняет ETag.'
+        )
@@ -0,0 +1,102 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+
+from tests.utils import create_catalogue
+
+
+async def asgi_request(application, method, path, query='', body=b'',
+                       headers=()):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': [(b'host', b'testserver'),
+                    (b'content-length', str(len(body)).encode()), *headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 5000),
+    }
+    communicator = ApplicationCommunicator(application, scope)
+    await communicator.send_input(
+        {'type': 'http.request', 'body': body, 'more_body': False})
+    start = await communicator.receive_output(10)
+    content = b''
+    while True:
+        message = await communicator.receive_output(10)
+        content += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+    return start['status'], content
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AsyncReads:
+
+    def test_01_reads_match_wsgi(self, client):
+        from api_yamdb.asgi import application
+
+        title = create_catalogue(3)[0]
+        for path in ('/api/v1/titles/', f'/api/v1/titles/{title.id}/',
+                     '/api/v1/genres/', '/api/v1/categories/',
+                     f'/api/v1/titles/{title.id}/reviews/'):
+            status, content = async_to_sync(asgi_request)(
+                application, 'GET', path)
+            assert status == HTTPStatus.OK, path
+            assert json.loads(content) == client.get(path).json(), (
+                f'Ответ на GET-запрос к `{path}` под ASGI должен совпадать '
+                'с ответом под WSGI.'
+            )
+
+    def test_02_async_view_is_used(self):
+        import asyncio
+
+        from django.urls import resolve
+
+        match = resolve('/api/v1/titles/', urlconf='api_yamdb.urls_async')
+        assert asyncio.iscoroutinefunction(match.func)
+        match = resolve('/api/v1/users/', urlconf='api_yamdb.urls_async')
+        assert not asyncio.iscoroutinefunction(match.func)
+
+    def test_03_writes_still_work(self, token_admin):
+        from api_yamdb.asgi import application
+
+        status, content = async_to_sync(asgi_request)(
+            application, 'POST', '/api/v1/genres/',
+            body=json.dumps({'name': 'Драма', 'slug': 'drama'}).encode(),
+            headers=[
+                (b'content-type', b'application/json'),
+                (b'authorization',
+                 f'Bearer {token_admin["access"]}'.encode()),
+            ])
+        assert status == HTTPStatus.CREATED, content
+
+    def test_04_metrics_see_pool_queries(self, settings):
+        from api.metrics import get_metrics, reset_metrics
+        from api_yamdb.asgi import AsyncReadsASGIHandler
+
+        settings.MIDDLEWARE = [
+            'api.metrics.RequestMetricsMiddleware', *settings.MIDDLEWARE]
+        application = AsyncReadsASGIHandler()
+        create_catalogue(3)
+        reset_metrics()
+        try:
+            status, _ = async_to_sync(asgi_request)(
+                application, 'GET', '/api/v1/titles/')
+            assert status == HTTPStatus.OK
+            stats = get_metrics()['GET api/v1/titles/$']
+        finally:
+            reset_metrics()
+        # Новое соединение потока пула ещё выполняет PRAGMA SQLite.
+        assert stats['avg_queries'] >= 3 and stats['avg_db_ms'] > 0, (
+            'Проверьте, что под ASGI метрики учитывают запросы к БД из '
+            'пула потоков чтения.'
+        )
+        assert stats['avg_render_ms'] > 0
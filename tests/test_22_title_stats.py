@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleStats:
+
+    def get_stats(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/stats/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/stats/` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_stats_follow_writes(self, admin_client, admin, user_client,
+                                    user, client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        stats = self.get_stats(client, title_id)
+        assert stats['reviews'] == 2 and stats['comments'] == 2, (
+            'Проверьте, что статистика считает отзывы и комментарии.'
+        )
+        assert stats['scores'] == {
+            str(score): 2 if score == 5 else 0 for score in range(1, 11)
+        }, 'Проверьте, что статистика содержит распределение оценок 1–10.'
+        assert stats['rating'] == 5
+
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        admin_client.patch(f'{url}{reviews[1]["id"]}/', data={'score': 9})
+        admin_client.delete(
+            f'{url}{reviews[0]["id"]}/comments/{comments[0]["id"]}/')
+        stats = self.get_stats(client, title_id)
+        assert (stats['scores']['5'], stats['scores']['9']) == (1, 1), (
+            'Проверьте, что распределение оценок меняется вместе с оценкой.'
+        )
+        assert stats['comments'] == 1, (
+            'Проверьте, что удалённый комментарий вычитается из статистики.'
+        )
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        stats = self.get_stats(client, title_id)
+        assert (stats['reviews'], stats['comments']) == (1, 0), (
+            'Проверьте, что при удалении отзыва из статистики вычитаются '
+            'и его комментарии.'
+        )
+        assert sum(stats['scores'].values()) == 1
+
+    def test_02_stats_read_counters(self, admin_client, admin, client,
+                                    django_assert_max_num_queries):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        with django_assert_max_num_queries(2):
+            self.get_stats(client, titles[0]['id'])
+        response = client.get('/api/v1/titles/0/stats/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_recalculate_counters(self, admin_client, admin):
+        from reviews.models import TitleCounter
+
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        expected = TitleCounter.get_stats(title_id)
+        TitleCounter.objects.all().delete()
+        TitleCounter.objects.create(
+            title_id=title_id, name=TitleCounter.REVIEWS, value=100)
+
+        call_command('recalculate_ratings')
+        assert TitleCounter.get_stats(title_id) == expected, (
+            'Команда `recalculate_ratings` должна восстанавливать счётчики.'
+        )
+
+    def test_04_counters_follow_moved_review(self, admin_client, admin):
+        from reviews.models import Review, Title, TitleCounter
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client})
+        first, second = titles[0]['id'], titles[1]['id']
+        review = Review.objects.get(pk=reviews[0]['id'])
+        review.title_id = second
+        review.save()
+        assert TitleCounter.get_stats(first)['comments'] == 0
+        assert TitleCounter.get_stats(second)['comments'] == 1, (
+            'Проверьте, что отзыв, перенесённый к другому произведению, '
+            'переносит и счётчик своих комментариев.'
+        )
+
+        Title.objects.get(pk=second).delete()
+        assert not TitleCounter.objects.filter(title_id=second).exists(), (
+            'Счётчики удалённого произведения не должны создаваться заново.'
+        )
@@ -0,0 +1,73 @@
+import datetime
+import io
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_reviews
+
+SAMPLE = {
+    'text': 'Отзыв с\u2028переносом "в кавычках"',
+    'pub_date': datetime.datetime(
+        2021, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2021, 5, 1),
+    'price': Decimal('1.50'),
+    'scores': {1: 0, 10: 2},
+    'genres': ({'name': 'Жанр', 'slug': 'genre'},),
+    'rating': None,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23FastJSON:
+
+    def test_01_renderer_matches_drf(self):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(SAMPLE) == JSONRenderer().render(
+            SAMPLE), (
+            'Проверьте, что FastJSONRenderer выдаёт тот же JSON, '
+            'что и JSONRenderer DRF.'
+        )
+        assert FastJSONRenderer().render(
+            SAMPLE, 'application/json; indent=4'
+        ) == JSONRenderer().render(SAMPLE, 'application/json; indent=4')
+
+    def test_02_api_output_matches_drf(self, admin_client, admin):
+        from api.serializers import ReadOnlyTitleSerializer, ReviewSerializer
+        from api.renderers import FastJSONRenderer
+        from reviews.models import Review, Title
+
+        create_reviews(admin_client, {admin: admin_client})
+        for data in (
+            ReadOnlyTitleSerializer(Title.objects.all(), many=True).data,
+            ReviewSerializer(Review.objects.all(), many=True).data,
+        ):
+            assert FastJSONRenderer().render(data) == (
+                JSONRenderer().render(data))
+
+    def test_03_fallback_without_orjson(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(SAMPLE) == (
+            JSONRenderer().render(SAMPLE))
+        assert parsers.FastJSONParser().parse(
+            io.BytesIO('{"name": "Жанр"}'.encode())) == {'name': 'Жанр'}
+
+    def test_04_parser(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": "Жанр", "slug": "genre"}',
+            content_type='application/json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что API принимает данные в формате JSON.'
+        )
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": ',
+            content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный JSON отклоняется со статусом 400.'
+        )
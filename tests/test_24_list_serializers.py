@@ -0,0 +1,65 @@
+import pytest
+
+from tests.utils import create_catalogue, create_comments
+
+
+def get_results(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.json()['results']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ListSerializers:
+
+    def test_01_titles_match_serializer(self, client):
+        from api.serializers import ReadOnlyTitleSerializer
+        from reviews.models import Category, Title
+
+        titles = create_catalogue(5)
+        Title.objects.filter(pk=titles[0].pk).update(category=None, rating=7)
+        Category.objects.filter(pk=titles[1].category_id).update(
+            name='Другая категория')
+        expected = ReadOnlyTitleSerializer(
+            Title.objects.all(), many=True).data
+        assert get_results(client, '/api/v1/titles/') == expected, (
+            'Проверьте, что список произведений совпадает с выводом '
+            '`ReadOnlyTitleSerializer`.'
+        )
+
+    def test_02_reviews_and_comments_match_serializers(
+            self, client, admin_client, admin, user_client, user):
+        from api.serializers import CommentSerializer, ReviewSerializer
+        from reviews.models import Comment, Review
+
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert get_results(client, url) == ReviewSerializer(
+            Review.objects.all(), many=True).data, (
+            'Проверьте, что список отзывов совпадает с выводом '
+            '`ReviewSerializer`.'
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        assert get_results(client, url) == CommentSerializer(
+            Comment.objects.all(), many=True).data, (
+            'Проверьте, что список комментариев совпадает с выводом '
+            '`CommentSerializer`.'
+        )
+        assert get_results(client, f'{url}?cursor=&limit=1')[0] == (
+            get_results(client, url)[0])
+
+    @pytest.mark.parametrize('authors_count', (1, 3))
+    def test_03_review_list_queries(self, client, django_assert_num_queries,
+                                    django_user_model, authors_count):
+        from reviews.models import Review
+
+        title = create_catalogue(1)[0]
+        for idx in range(authors_count):
+            author = django_user_model.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5)
+        # Произведение, число отзывов и страница с авторами.
+        with django_assert_num_queries(3):
+            client.get(f'/api/v1/titles/{title.id}/reviews/')
@@ -0,0 +1,32 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+
+class Test25UsernameValidator:
+
+    @pytest.mark.parametrize('username', ('me', 'ME', 'Me'))
+    def test_01_reserved_usernames(self, username):
+        from reviews.validators import validate_username
+
+        with pytest.raises(ValidationError):
+            validate_username(username)
+
+    def test_02_wrong_symbols(self):
+        from reviews.validators import validate_username
+
+        validate_username('user.name@mail+1-2_3')
+        with pytest.raises(ValidationError) as error:
+            validate_username('user name!!')
+        assert error.value.messages == [
+            'Обнаружены недопустимые символы:  , !!'
+        ], 'Проверьте, что в ошибке перечислены недопустимые символы.'
+
+    def test_03_follows_settings(self, settings):
+        from reviews.validators import validate_username
+
+        settings.RESERVED_USERNAMES = ['Admin']
+        settings.VALID_USERNAME = r'[^a-z]+'
+        validate_username('me')
+        for username in ('admin', 'user1'):
+            with pytest.raises(ValidationError):
+                validate_username(username)
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+def signup(client, idx, **extra):
+    return client.post(SIGNUP_URL, data={
+        'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'}, **extra)
+
+
+@pytest.fixture
+def rates(settings):
+    settings.AUTH_THROTTLE = {
+        **settings.AUTH_THROTTLE,
+        'RATES': {'ip': '3/min', 'username': '2/min'},
+    }
+    return settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthThrottling:
+
+    def test_01_ip_throttle(self, client, rates, django_assert_num_queries):
+        for idx in range(3):
+            assert signup(client, idx).status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы с одного IP к `/api/v1/auth/` '
+            'отклоняются со статусом 429 без обращения к БД.'
+        )
+        assert int(response['Retry-After']) > 0
+        response = signup(client, 4, REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит считается отдельно для каждого IP.'
+        )
+
+    def test_02_username_throttle(self, client, rates, user):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for idx in range(2):
+            response = client.post(
+                TOKEN_URL, data=data, REMOTE_ADDR=f'10.0.0.{idx}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(TOKEN_URL, data={
+            **data, 'username': user.username.upper()
+        }, REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода для одного пользователя '
+            'ограничивается независимо от IP.'
+        )
+
+    def test_03_cache_store(self, client, rates):
+        from django.core.cache import cache
+
+        rates.AUTH_THROTTLE = {**rates.AUTH_THROTTLE, 'STORE': 'cache'}
+        for idx in range(3):
+            assert signup(client, idx).status_code == HTTPStatus.OK
+        assert signup(client, 3).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS)
+        assert cache.get('throttle:ip:127.0.0.1') is not None, (
+            'Проверьте, что с STORE=cache вёдра хранятся в кэше Django.'
+        )
+
+    def test_04_bucket_refills(self):
+        from api.throttling import take_token
+
+        state, wait = None, 0
+        for _ in range(2):
+            state, wait = take_token(state, 2, 60, now=0)
+        assert wait == 0
+        state, wait = take_token(state, 2, 60, now=0)
+        assert wait == pytest.approx(30)
+        _, wait = take_token(state, 2, 60, now=30)
+        assert wait == 0, 'Ведро должно наполняться со временем.'
+
+    def test_05_forwarded_for_is_not_trusted(self, client, rates):
+        for idx in range(3):
+            response = signup(
+                client, idx, HTTP_X_FORWARDED_FOR=f'10.1.0.{idx}')
+            assert response.status_code == HTTPStatus.OK
+        response = signup(client, 3, HTTP_X_FORWARDED_FOR='10.1.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без доверенных прокси лимит по IP нельзя обойти '
+            'заголовком `X-Forwarded-For`.'
+        )
+
+        rates.REST_FRAMEWORK = {**rates.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        response = signup(client, 4, HTTP_X_FORWARDED_FOR='10.1.0.9')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что за прокси (`NUM_PROXIES`) адрес клиента берётся '
+            'из `X-Forwarded-For`.'
+        )
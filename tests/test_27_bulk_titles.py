@@ -0,0 +1,103 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalogue
+
+URL = '/api/v1/titles/bulk/'
+
+
+def post_bulk(client, items):
+    return client.post(URL, data=json.dumps(items),
+                       content_type='application/json')
+
+
+def make_items(count, category='cat-0', genre=('genre-0', 'genre-1')):
+    return [{'name': f'Новое {idx}', 'year': 1990, 'category': category,
+             'genre': list(genre)} for idx in range(count)]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27BulkTitles:
+
+    def test_01_bulk_create(self, admin_client, client,
+                            django_assert_max_num_queries):
+        from reviews.models import Title
+
+        create_catalogue(0)
+        with django_assert_max_num_queries(10):
+            response = post_bulk(admin_client, make_items(50))
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакет корректных произведений создаётся '
+            'со статусом 201.'
+        )
+        results = response.json()['results']
+        assert len(results) == 50 and response.json()['created'] == 50
+        title = Title.objects.get(pk=results[7]['id'])
+        assert title.name == 'Новое 7', (
+            'Проверьте, что в ответе id созданных произведений идут в '
+            'порядке запроса.'
+        )
+        data = client.get(f'/api/v1/titles/{title.id}/').json()
+        assert [genre['slug'] for genre in data['genre']] == [
+            'genre-0', 'genre-1']
+        assert data['category']['slug'] == 'cat-0'
+        assert client.get('/api/v1/titles/').json()['count'] == 50, (
+            'Проверьте, что после пакетной записи список не отдаётся '
+            'из устаревшего кэша.'
+        )
+
+    def test_02_per_item_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_catalogue(0)
+        items = make_items(2)
+        items.insert(1, {'name': 'Без года', 'category': 'cat-0',
+                         'genre': []})
+        items.append({'name': 'Нет жанра', 'year': 2000,
+                      'category': 'unknown', 'genre': ['genre-0', 'nope']})
+        response = post_bulk(admin_client, items)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert 'year' in results[1]['errors']
+        assert set(results[3]['errors']) == {'category', 'genre'}, (
+            'Проверьте, что ошибки возвращаются для каждого элемента.'
+        )
+        assert [result.get('id') is not None for result in results] == [
+            True, False, True, False]
+        assert Title.objects.count() == 2
+
+    def test_03_bulk_update(self, admin_client, client):
+        titles = create_catalogue(2)
+        response = post_bulk(admin_client, [
+            {'id': titles[0].id, 'name': 'Переименовано',
+             'genre': ['genre-2']},
+            {'id': titles[1].id, 'year': 1999},
+            {'id': 0, 'year': 1999},
+        ])
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['updated'] == 2
+        assert 'id' in response.json()['results'][2]['errors']
+        data = client.get(f'/api/v1/titles/{titles[0].id}/').json()
+        assert data['name'] == 'Переименовано'
+        assert [genre['slug'] for genre in data['genre']] == ['genre-2'], (
+            'Проверьте, что жанры произведения заменяются переданными.'
+        )
+        data = client.get(f'/api/v1/titles/{titles[1].id}/').json()
+        assert (data['year'], data['name']) == (1999, titles[1].name)
+
+    def test_04_access_and_limits(self, admin_client, user_client, client,
+                                  settings):
+        create_catalogue(0)
+        assert post_bulk(client, make_items(1)).status_code == (
+            HTTPStatus.UNAUTHORIZED)
+        assert post_bulk(user_client, make_items(1)).status_code == (
+            HTTPStatus.FORBIDDEN)
+        settings.LIMIT_BULK_TITLES = 2
+        assert post_bulk(admin_client, make_items(3)).status_code == (
+            HTTPStatus.BAD_REQUEST)
+        response = admin_client.post(
+            URL, data=json.dumps({'name': 'Не список'}),
+            content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
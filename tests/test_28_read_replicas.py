@@ -0,0 +1,152 @@
+from http import HTTPStatus
+
+import pytest
+
+REPLICA = 'replica_test'
+
+
+@pytest.fixture
+def replica(transactional_db, tmp_path, settings):
+    """ Вторая база SQLite в роли реплики без репликации.
+
+    Подключается после настройки тестовой базы, поэтому pytest-django
+    не запрещает к ней запросы.
+    """
+    from django.core.management import call_command
+    from django.db import connections
+
+    connections.databases[REPLICA] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {},
+    }
+    call_command('migrate', database=REPLICA, verbosity=0)
+    settings.READ_REPLICAS = {**settings.READ_REPLICAS, 'ALIASES': [REPLICA]}
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def titles_count(client):
+    response = client.get('/api/v1/titles/')
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['count']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ReadReplicas:
+
+    def test_01_reads_go_to_replica(self, replica, admin_client, client):
+        from reviews.models import Category, Title
+
+        category = Category.objects.using(replica).create(
+            name='Реплика', slug='replica')
+        Title.objects.using(replica).create(
+            name='С реплики', year=2000, category=category)
+        assert titles_count(client) == 1, (
+            'Проверьте, что GET-запросы к API читают с реплики.'
+        )
+        response = admin_client.post('/api/v1/categories/', data={
+            'name': 'Основная', 'slug': 'primary'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert not Category.objects.using(replica).filter(
+            slug='primary').exists(), (
+            'Проверьте, что запись идёт только в основную базу.'
+        )
+
+    def test_02_read_your_writes(self, replica, admin_client, admin, client,
+                                 settings):
+        from django.core.cache import caches
+
+        from api_yamdb.db_routers import get_sticky_key
+
+        create = admin_client.post('/api/v1/categories/', data={
+            'name': 'Основная', 'slug': 'primary'})
+        assert create.status_code == HTTPStatus.CREATED
+        assert len(admin_client.get('/api/v1/categories/').json()[
+            'results']) == 1, (
+            'Проверьте, что после записи пользователь читает из основной '
+            'базы и видит свои изменения.'
+        )
+        assert client.get('/api/v1/categories/').json()['count'] == 0, (
+            'Проверьте, что остальные пользователи читают с реплики.'
+        )
+        caches[settings.READ_REPLICAS['CACHE_ALIAS']].delete(
+            get_sticky_key(admin))
+        assert admin_client.get('/api/v1/categories/').json()[
+            'count'] == 0
+
+    def test_03_router(self, replica):
+        from api_yamdb import db_routers
+        from reviews.models import Category
+
+        router = db_routers.ReplicaRouter()
+        assert router.db_for_read(Category) is None
+        db_routers.use_replicas(True)
+        try:
+            assert router.db_for_read(Category) == replica
+            category = Category.objects.create(name='Жанр', slug='genre')
+        finally:
+            db_routers.use_replicas(False)
+        category._state.db = replica
+        assert router.db_for_write(Category, instance=category) == 'default'
+
+    def test_04_replica_reads_are_not_cached(self, replica, admin_client,
+                                             client, settings):
+        from reviews.models import Category
+
+        settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': True}
+        create = admin_client.post('/api/v1/categories/', data={
+            'name': 'Основная', 'slug': 'primary'})
+        assert create.status_code == HTTPStatus.CREATED
+        # Реплика ещё не догнала основную базу, а версия уже новая.
+        for url in ('/api/v1/categories/', '/api/v1/categories/?limit=1'):
+            response = client.get(url)
+            assert response.json()['count'] == 0
+            assert 'ETag' not in response, (
+                'Проверьте, что ответ, прочитанный с реплики, не получает '
+                'ETag текущей версии данных.'
+            )
+        Category.objects.using(replica).create(
+            name='Основная', slug='primary')
+        for url in ('/api/v1/categories/', '/api/v1/categories/?limit=2'):
+            assert client.get(url).json()['count'] == 1, (
+                'Проверьте, что ответы и число объектов, прочитанные с '
+                'отстающей реплики, не остаются в кэше.'
+            )
+        response = admin_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1 and 'ETag' in response
+
+    def test_05_error_resets_replica_reads(self, replica, monkeypatch):
+        from django.db import OperationalError
+        from django.test import Client
+
+        from api.views import GenreViewSet
+        from api_yamdb import db_routers
+
+        def fail(*args, **kwargs):
+            raise OperationalError('Реплика недоступна')
+
+        monkeypatch.setattr(GenreViewSet, 'list', fail)
+        client = Client(raise_request_exception=False)
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert not db_routers.replicas_in_use(), (
+            'Проверьте, что после ошибки в запросе поток перестаёт читать '
+            'с реплик.'
+        )
+
+    def test_06_search_reads_replica(self, replica, client):
+        from reviews.models import Category, Title
+
+        category = Category.objects.using(replica).create(
+            name='Реплика', slug='replica')
+        Title.objects.using(replica).create(
+            name='Только на реплике', year=2000, category=category)
+        response = client.get('/api/v1/titles/search/', {'q': 'реплике'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поиск читает с реплик.'
+        )
@@ -244,6 +244,27 @@ def create_titles(admin_client):
     return result, categories, genres
 
 
+def create_catalogue(titles_count):
+    from reviews.models import Category, Genre, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    titles = []
+    for idx in range(titles_count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000,
+            category=categories[idx % len(categories)])
+        title.genre.set(genres[:idx % len(genres) + 1])
+        titles.append(title)
+    return titles
+
+
 def create_reviews(admin_client, authors_map):
     titles, _, _ = create_titles(admin_client)
     result = []